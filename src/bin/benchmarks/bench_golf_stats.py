@@ -0,0 +1,181 @@
+# Description: Benchmark the Stats getters against synthetic Garmin scorecards of increasing size.
+# Author: Michael Krakovsky
+
+from sys import path, stderr, stdout
+path.extend('../../../../')                      # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis.get_golf_stats import Stats
+from My_Golf_Journey.src.bin.stat_apis.hole_rollups import rebuild_rollups
+from My_Golf_Journey.src.bin.stat_apis import instrumentation
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from json import dump
+from random import Random
+from time import perf_counter
+import tracemalloc
+
+getters = ['get_putting_avg_by_hole', 'get_scoring_avg_by_hole', 'get_hole_pars', 'get_fairways',
+    'get_fairway_accuracy', 'get_green_accuracy', 'get_course_summary', 'get_course_summaries', 'get_rolling_trend']
+all_course_getters = ['get_course_summaries']                                   # Timed over every course at once.
+mongod_only_getters = ['get_rolling_trend']                                     # mongomock implements neither $setWindowFields nor $substrCP.
+fairway_outcomes = ['HIT', 'HIT', 'LEFT', 'RIGHT', 'SHORT']
+
+class CountingCollection():
+
+    def __init__(self, collection):
+
+        """
+        Class Description: Wrap a collection to count the round trips made to the database.
+        Class Instantiators: collection (Collection: The collection to wrap.)
+        """
+
+        self._collection = collection
+        self.round_trips = 0
+
+    def __getattr__(self, name):
+
+        attribute = getattr(self._collection, name)
+        if name in ('aggregate', 'find', 'find_one', 'count_documents', 'distinct'):
+            def counted(*args, **kwargs):
+                self.round_trips += 1
+                return attribute(*args, **kwargs)
+            return counted
+        return attribute
+
+def synthetic_course(course_id, rng):
+
+    """
+    Function Description: Make up the pars of an 18 hole course.
+    Function Parameters: course_id (Int: The course id.), rng (Random: The random number generator.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The course snapshot shaped like Garmin's.)
+    """
+
+    return {'courseGlobalId': course_id, 'holePars': ''.join(rng.choice('3444445') for _ in range(18))}
+
+def synthetic_scorecard(scorecard_id, course, start_time, rng):
+
+    """
+    Function Description: Make up an 18 hole round shaped like a Garmin scorecard detail document.
+    Function Parameters: scorecard_id (Int: The scorecard id.), course (Dict: The course snapshot.),
+        start_time (Datetime: When the round started.), rng (Random: The random number generator.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The scorecard document.)
+    """
+
+    holes = []
+    for number, par in enumerate(course['holePars'], start=1):
+        putts = rng.choice([1, 2, 2, 2, 3])
+        hole = {'number': number, 'strokes': max(int(par) + rng.choice([-1, 0, 0, 1, 1, 2, 3]), putts + 1), 'putts': putts}
+        if par != '3':
+            hole['fairwayShotOutcome'] = rng.choice(fairway_outcomes)
+        holes.append(hole)
+    return {
+        'scorecardDetails': [{
+            'scorecard': {'id': scorecard_id, 'courseGlobalId': course['courseGlobalId'], 'holesCompleted': 18,
+                'startTime': start_time.strftime('%Y-%m-%dT%H:%M:%S.0'), 'strokes': sum(hole['strokes'] for hole in holes), 'holes': holes},
+            'scorecardStats': {'round': {'putts': sum(hole['putts'] for hole in holes)}}
+        }],
+        'courseSnapshots': [course]
+    }
+
+def synthetic_scorecards(rounds, courses, seed=0):
+
+    """
+    Function Description: Make up rounds spread evenly across courses, one day apart.
+    Function Parameters: rounds (Int: The rounds per course.), courses (Int: The number of courses.), seed (Int: The random seed.)
+    Function Throws: Nothing
+    Function Returns: (List: The scorecard documents.)
+    """
+
+    rng = Random(seed)
+    snapshots = [synthetic_course(10000 + course, rng) for course in range(courses)]
+    start = datetime(2018, 1, 1, 9)
+    return [synthetic_scorecard(round * courses + index, course, start + timedelta(days=round), rng)
+        for round in range(rounds) for index, course in enumerate(snapshots)]
+
+def time_getter(stats, getter, course_id, repeat):
+
+    """
+    Function Description: Time a getter, count its round trips and measure the peak memory it allocates.
+    Function Parameters: stats (Stats: The stats object with counting collections.), getter (String: The getter name.),
+        course_id (Int: The course id. Every course is used by the getters that summarise many courses.), repeat (Int: The number of timed runs.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The fastest wall time, the round trips and the peak memory of one run.)
+    """
+
+    method = getattr(stats, getter)
+    course_id = None if getter in all_course_getters else course_id
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        method(course_id)
+        times.append(perf_counter() - start)
+    stats.collection.round_trips = stats.rollups.round_trips = 0
+    tracemalloc.start()
+    method(course_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'wall_seconds': min(times), 'round_trips': stats.collection.round_trips + stats.rollups.round_trips, 'peak_bytes': peak}
+
+def run_benchmarks(database, sizes, courses, sources, repeat, skip=()):
+
+    """
+    Function Description: Benchmark every getter at every dataset size.
+    Function Parameters: database (Database: An empty database to fill with synthetic scorecards.), sizes (List: The rounds per course to test.),
+        courses (Int: The number of courses.), sources (List: The Stats sources to test, 'mongo' and/or 'rollups'.), repeat (Int: The timed runs per getter.),
+        skip (List: The getters the database cannot run.)
+    Function Throws: Nothing
+    Function Returns: (List: One result per size, source and getter.)
+    """
+
+    results = []
+    for rounds in sizes:
+        database.Scorecards.drop()
+        database.Scorecards.insert_many(synthetic_scorecards(rounds, courses))
+        rebuild_rollups(database.Scorecards)
+        course_id = database.Scorecards.find_one()['courseSnapshots'][0]['courseGlobalId']
+        for source in sources:
+            stats = Stats(source=source, collection=CountingCollection(database.Scorecards))
+            stats.rollups = CountingCollection(database.HoleRollups)
+            for getter in getters:
+                if getter in skip:
+                    continue
+                result = {'rounds_per_course': rounds, 'courses': courses, 'holes': rounds * courses * 18, 'source': source, 'getter': getter}
+                result.update(time_getter(stats, getter, course_id, repeat))
+                results.append(result)
+    return results
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description='Benchmark the Stats getters against synthetic scorecards.')
+    parser.add_argument('--conn-str', help='A local mongod to fill with synthetic data. mongomock is used when not given.')
+    parser.add_argument('--database', default='Golf_Stats_Benchmark', help='The database to fill. It is dropped when the run ends.')
+    parser.add_argument('--sizes', default='50,200,800', help='The rounds per course to test, separated by commas.')
+    parser.add_argument('--courses', type=int, default=4, help='The number of courses.')
+    parser.add_argument('--sources', default='mongo,rollups', help='The Stats sources to test, separated by commas.')
+    parser.add_argument('--repeat', type=int, default=3, help='The timed runs per getter.')
+    parser.add_argument('--output', help='Where to write the JSON results. Printed when not given.')
+    parser.add_argument('--phases', action='store_true', help='Also report the time, documents and rows of each phase of the getters.')
+    args = parser.parse_args()
+    if args.phases:
+        instrumentation.enable()
+    skip = []
+    if args.conn_str:
+        from pymongo import MongoClient
+        client = MongoClient(args.conn_str)
+    else:
+        from mongomock import MongoClient
+        client = MongoClient()
+        skip = mongod_only_getters
+        print("Skipping {} on mongomock. Pass --conn-str to time it.".format(', '.join(skip)), file=stderr)
+    try:
+        results = run_benchmarks(client[args.database], [int(size) for size in args.sizes.split(',')], args.courses,
+            args.sources.split(','), args.repeat, skip)
+    finally:
+        client.drop_database(args.database)
+    if args.phases:
+        results = {'getters': results, 'phases': instrumentation.snapshot()}
+    if args.output:
+        with open(args.output, 'w') as f:
+            dump(results, f, indent=2)
+    else:
+        dump(results, stdout, indent=2)
@@ -0,0 +1,64 @@
+# Description: Measure the memory of the hole records loaded with default dtypes against the compact schema.
+# Author: Michael Krakovsky
+
+from sys import path, stdout
+path.extend('../../../../')                      # Import the entire project.
+from My_Golf_Journey.src.bin.benchmarks.bench_golf_stats import synthetic_scorecards
+from My_Golf_Journey.src.bin.stat_apis.hole_records import frame_from_cursor
+from argparse import ArgumentParser
+from json import dump
+from pandas import DataFrame
+import tracemalloc
+
+def hole_records(scorecards):
+
+    """
+    Function Description: Unwind scorecards into the hole records the hole query returns, one at a time like a cursor.
+    Function Parameters: scorecards (List: The scorecard documents.)
+    Function Throws: Nothing
+    Function Returns: (Generator: The hole records.)
+    """
+
+    for scorecard in scorecards:
+        details = scorecard['scorecardDetails'][0]['scorecard']
+        pars = scorecard['courseSnapshots'][0]['holePars']
+        for hole in details['holes']:
+            yield {'scorecard_id': details['id'], 'course_id': details['courseGlobalId'], 'start_time': details['startTime'],
+                'holes_completed': details['holesCompleted'], 'hole': hole['number'], 'strokes': hole['strokes'], 'putts': hole['putts'],
+                'fairway': hole.get('fairwayShotOutcome', 'NO_ENTRY'), 'par': int(pars[hole['number'] - 1])}
+
+def measure(load, scorecards):
+
+    """
+    Function Description: Measure the peak memory allocated while loading the hole records and the size of the frame loaded.
+    Function Parameters: load (Function: Builds a frame from a record iterator.), scorecards (List: The scorecard documents.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The rows, the peak bytes and the frame bytes.)
+    """
+
+    tracemalloc.start()
+    df = load(hole_records(scorecards))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'rows': len(df), 'peak_bytes': peak, 'frame_bytes': int(df.memory_usage(deep=True).sum())}
+
+def run_benchmark(holes, courses=4):
+
+    """
+    Function Description: Compare a frame built from a list of every record with the compact frame streamed from the records.
+    Function Parameters: holes (Int: The number of hole records, rounded up to whole rounds.), courses (Int: The number of courses.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The measurements of each loader.)
+    """
+
+    scorecards = synthetic_scorecards(-(-holes // (18 * courses)), courses)
+    return {
+        'list_of_dicts': measure(lambda records: DataFrame(list(records)), scorecards),
+        'compact_stream': measure(frame_from_cursor, scorecards)
+    }
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description='Measure the memory of the hole records with default and compact dtypes.')
+    parser.add_argument('--holes', type=int, default=100000, help='The number of hole records.')
+    args = parser.parse_args()
+    dump(run_benchmark(args.holes), stdout, indent=2)
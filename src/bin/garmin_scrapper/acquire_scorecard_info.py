@@ -3,16 +3,23 @@
 # Script Author: Michael Krakovsky 
 
 
-from sys import path
+from sys import path, argv
 path.extend('../../../')                                                                    # Import the entire project.
-from My_Golf_Journey.config import garmin_info, exe_paths, mongo_config
+from My_Golf_Journey.config import garmin_info, exe_paths
+from My_Golf_Journey.src.bin.garmin_scrapper.fetch_engine import session_from_driver
+from My_Golf_Journey.src.bin.garmin_scrapper.checkpointed_ingest import Checkpoint, Quarantine, sync_scorecards
+from My_Golf_Journey.src.bin.garmin_scrapper.scorecard_archive import ScorecardArchive
+from My_Golf_Journey.src.bin.stat_apis.index_advisor import ensure_indexes
+from My_Golf_Journey.src.bin.stat_apis.mongo_connection import close as close_connection, get_scorecards_collection
+from My_Golf_Journey.src.bin.stat_apis.instrumentation import enable as enable_instrumentation, instrumented, phase, write_snapshot
+from My_Golf_Journey.src.bin.garmin_scrapper.scorecard_ids import iter_score_card_ids, source_pages
 from pathlib import Path
 from selenium import webdriver
+from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from re import findall
-from time import sleep
-from pymongo import MongoClient
-from json import loads
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+from time import perf_counter
 
 username_field = '//input[@name="username"]'
 password_field = '//input[@name="password"]'
@@ -21,21 +28,22 @@ frame = '//iframe'
 gen_url = "https://connect.garmin.com/signin/"
 score_url = 'https://connect.garmin.com/modern/profile/433ae1d7-ba04-4209-bfa4-4814c426397d/scorecards'
 source_data_location = Path(__file__).absolute().parent.parent.parent / 'data' / 'score_card_source.txt'
-log_file = Path(__file__).absolute().parent.parent.parent.parent / 'logs' / 'score_card_source_logs.txt'
+metrics_location = Path(__file__).absolute().parent.parent.parent.parent / 'logs' / 'ingest_metrics.json'
+page_timeout = 30                                                                           # The most seconds to wait for a page to load.
+fetch_options = {'batch_size': 20, 'rate': 2.0, 'concurrency': 4, 'retries': 3, 'backoff': 1.0}    # Batching, rate limit and retries of the scorecard fetches.
 
 def connect_to_scorecards_collection():
 
     """
-    Function Description: Connecto the scorecards collections.
+    Function Description: Connecto the scorecards collections through the shared connection.
     Function Parameters: Nothing
     Function Throws: Nothing
     Function Returns: (Collection: The MongoDB connection.)
     """
 
-    client = MongoClient(mongo_config['conn_str'])
-    client.list_database_names()
-    db = client.Golf_Stats_DB
-    return db.Scorecards
+    collection = get_scorecards_collection()
+    ensure_indexes(collection)                                              # Look ups and upserts by scorecard id rely on the indexes.
+    return collection
 
 def enter_text_w_xpath(xpath, val, driver):
 
@@ -62,18 +70,20 @@ def login_garmin(get_scorecard_ids=False):
 
     
     driver = webdriver.Chrome(executable_path=exe_paths['sel_driver'])            # Open session.
+    wait = WebDriverWait(driver, page_timeout)
     driver.get(gen_url)
-    sleep(3)                                                                      # Switch into frame.
-    iframe = driver.find_element_by_xpath(frame)
+    iframe = wait.until(expected_conditions.presence_of_element_located((By.XPATH, frame)))    # Switch into frame once it loads.
     driver.switch_to.frame(iframe)
+    wait.until(expected_conditions.presence_of_element_located((By.XPATH, username_field)))
     enter_text_w_xpath(username_field, garmin_info['username'], driver)           # Enter credentials.
     enter_text_w_xpath(password_field, garmin_info['password'], driver)
     driver.find_element_by_xpath(submit_button).click()
+    driver.switch_to.default_content()
+    wait.until(expected_conditions.url_contains('/modern'))                       # Garmin redirects into the app once signed in.
 
     if get_scorecard_ids:
-        sleep(12)
         driver.get(score_url)                                                     # Go to score cards.
-        sleep(10)
+        wait.until(expected_conditions.presence_of_element_located((By.XPATH, '//*[@data-scorecard-id]')))
         source = driver.page_source                                               # Dump page into file for parsing. This will contain our scorecard ids.
         with open(source_data_location.absolute(), 'w+', encoding='utf-8') as f:
             f.write(source)
@@ -82,81 +92,59 @@ def login_garmin(get_scorecard_ids=False):
 def parse_score_card_ids():
 
     """
-    Function Description: Parse the page source to retrieve all the scorecard ids on a particular page.
+    Function Description: Parse the page sources to retrieve all the scorecard ids. The pages are streamed rather than read whole.
     Function Parameters: Nothing
     Function Throws: Nothing
     Function Returns: (List: The score card ids that are retrieved.)
     """
 
-    with open(source_data_location, 'r', encoding='utf-8') as f:
-        text = f.read()
-    ids = findall("data-scorecard-id=\"\\d*\"", text)
-    return [int(findall("\\d\\d*", id)[0]) for id in ids]
+    return list(iter_score_card_ids(source_pages(source_data_location)))
 
-def check_scorecard(id, mongo_conn):
-
-    """
-    Function Description: Check to see if the scorecard exists in the DB.
-    Function Parameters: id (Int: The id of the scorecard from Garmin we are inserting.),
-        mongo_conn (Collection: The connection to the Mongo Collection.)
-    Function Throws: Nothing
-    Function Returns: (Boolean: True if the scorecard exists and False otherwise.) 
-    """
-
-    scorecard = mongo_conn.find_one({"scorecardDetails.scorecard.id":id})
-    if scorecard == None:
-        return False
-    return True
-
-def insert_scorecard(json_text, mongo_conn):
-
-    """
-    Function Description: Add scorecard information into the Mongo Database.
-    Function Parameters: json_text (JSON: The json dictionary containing our desired information.),
-        mongo_conn (Collection: The connection to the Mongo Collection.)
-    Function Throws: Nothing
-    Function Returns: (Boolean: True or False depending on if the information is inserted.)
-    """
-    
-    try:
-        post = loads(json_text)
-    except:
-        with open(log_file, 'w+') as f:
-            f.write(str(json_text))
-            raise ValueError("Unable to insert Object into Mongo DB. Check the log file at {}.".format(log_file.absolute()))
-    mongo_conn.insert_one(post).inserted_id
-    return True
-
-def get_scorecard_info(get_scorecard_ids):
+@instrumented
+def get_scorecard_info(get_scorecard_ids, refresh=False):
     
     """
-    Function Description: Retrieve the scorecard and game information from all the scorecard ids.
-    Function Parameters: get_scorecard_ids (Boolean: An indication to record the known scorecard ids.)
+    Function Description: Retrieve the scorecard and game information from all the scorecard ids. A run that stopped part way is resumed
+        from its checkpoint without parsing the ids again.
+    Function Parameters: get_scorecard_ids (Boolean: An indication to record the known scorecard ids.),
+        refresh (Boolean: Fetch the stored scorecards again and rewrite the ones edited in Garmin.)
     Function Throws: Nothing
     Function Returns: (Boolean: True or False depending on the behavior of our script.)
     """
 
-    collection = connect_to_scorecards_collection()
-    driver = login_garmin(get_scorecard_ids=get_scorecard_ids)
-    sleep(10)                                                      # Wait prior to starting to parse the next score card.
+    start = perf_counter()
+    with phase('connect'):
+        collection = connect_to_scorecards_collection()
+    checkpoint = Checkpoint()
+    resuming = checkpoint.in_progress()
+    with phase('login'):
+        driver = login_garmin(get_scorecard_ids=get_scorecard_ids and not resuming)
+        session = session_from_driver(driver, pool_size=fetch_options['concurrency'])    # The browser is only needed to sign in.
+        driver.quit()
+    with phase('parse_ids') as parse:
+        ids = [] if resuming else parse_score_card_ids()                               # A resumed run keeps the ids it parsed.
+        parse.count(rows=len(ids))
+    quarantine = Quarantine()
     # Sample Link: https://connect.garmin.com/modern/proxy/gcs-golfcommunity/api/v2/scorecard/detail?scorecard-ids=155069236&include-next-previous-ids=true&user-locale=en
-    ids = parse_score_card_ids()
-    url = 'https://connect.garmin.com/modern/proxy/gcs-golfcommunity/api/v2/scorecard/detail?scorecard-ids={}&include-next-previous-ids=true&user-locale=en'  
-    counter = 0
-    for id in ids:
-        is_in = check_scorecard(id, collection)               
-        if not is_in:                                                 # Ensure that the scorecard does not already exist in the DB. Insert if not done already.
-            driver.get(url.format(id))
-            sleep(1)
-            json_text = findall('{.*}', str(driver.page_source))[0]   # Retrieve only the contents within the curley brackets.
-            sleep(1)
-            insert_scorecard(json_text, collection)
-            counter += 1
-    print("We have inserted {} scorecards.".format(counter))
+    counts = sync_scorecards(session, ids, collection, checkpoint, quarantine, refresh=refresh,
+        fetch_options=dict(fetch_options, archive=ScorecardArchive()))                 # Keep the raw responses so the collection can be rebuilt offline.
+    if quarantine.count:
+        print("Unable to store {} scorecards. Their errors are in {}.".format(quarantine.count, quarantine.location))
+    print("We have inserted {} scorecards, updated {}, left {} unchanged, skipped {} and failed {} in {:.1f} seconds.".format(
+        counts['inserted'], counts['updated'], counts['unchanged'], counts['skipped'], counts['failed'], perf_counter() - start))
     return True
 
 if __name__ == "__main__":
-    result = get_scorecard_info(True)
+    if '--metrics' in argv:
+        enable_instrumentation()                                          # Time every stage of the run.
+    try:
+        result = get_scorecard_info(True, refresh='--refresh' in argv)
+    finally:
+        close_connection()
+        if '--metrics' in argv:
+            metrics_location.parent.mkdir(parents=True, exist_ok=True)
+            write_snapshot(metrics_location)
+            print("The timings of each stage are in {}.".format(metrics_location))
     if result:
         print("The scorecards were retrieved from Garmin and inserted. Please check MongoDB.")
     else:
@@ -0,0 +1,198 @@
+# Script Description: Ingest scorecards in resumable steps, rewriting only the scorecards that are new or were edited in Garmin.
+# Script Author: Michael Krakovsky
+
+from sys import path
+path.extend('../../../')                                                                    # Import the entire project.
+from My_Golf_Journey.src.bin.garmin_scrapper.fetch_engine import chunk_ids, fetch_scorecards
+from My_Golf_Journey.src.bin.stat_apis.instrumentation import instrumented, phase
+from My_Golf_Journey.src.bin.garmin_scrapper.scorecard_store import (bulk_upsert_scorecards, find_missing_ids, scorecard_modified,
+    stored_modified_times)
+from datetime import datetime
+from hashlib import sha256
+from json import dump, dumps, load
+from os import replace
+from pathlib import Path
+
+checkpoint_location = Path(__file__).absolute().parent.parent.parent / 'data' / 'ingest_checkpoint.json'
+quarantine_directory = Path(__file__).absolute().parent.parent.parent.parent / 'logs' / 'quarantine'
+checkpoint_every = 100                                                                      # The scorecards fetched and written between checkpoints.
+
+def content_hash(scorecard_doc):
+
+    """
+    Function Description: Hash the content of a scorecard so an edit in Garmin can be told apart from the scorecard already stored.
+    Function Parameters: scorecard_doc (Dict: The scorecard document from Garmin.)
+    Function Throws: Nothing
+    Function Returns: (String: The hex digest of the document without its MongoDB id.)
+    """
+
+    content = {key: value for key, value in scorecard_doc.items() if key != '_id'}
+    return sha256(dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+class Checkpoint():
+
+    def __init__(self, location=checkpoint_location):
+
+        """
+        Class Description: Remember the hash of every scorecard ingested and the progress of the current run in a JSON file.
+        Class Instantiators: location (Path: Where the checkpoint is kept.)
+        """
+
+        self.location = Path(location)
+        self.state = {'scorecards': {}, 'run': None}
+        if self.location.exists():
+            with open(self.location, 'r', encoding='utf-8') as f:
+                self.state = load(f)
+
+    def save(self):
+
+        """
+        Function Description: Write the checkpoint. The file is swapped in so a crash while writing keeps the last checkpoint.
+        Function Parameters: Nothing
+        Function Throws: Nothing
+        Function Returns: Nothing
+        """
+
+        self.location.parent.mkdir(parents=True, exist_ok=True)
+        temp_location = self.location.with_suffix('.tmp')
+        with open(temp_location, 'w', encoding='utf-8') as f:
+            dump(self.state, f)
+        replace(temp_location, self.location)
+
+    def in_progress(self):
+
+        """
+        Function Description: Check whether the last run stopped before it finished.
+        Function Parameters: Nothing
+        Function Throws: Nothing
+        Function Returns: (Boolean: True if there is a run to resume and False otherwise.)
+        """
+
+        return self.state['run'] is not None
+
+    def start_run(self, ids):
+
+        """
+        Function Description: Start a run over the scorecard ids, or resume the run that stopped.
+        Function Parameters: ids (List: The scorecard ids parsed for a new run. Ignored when resuming.)
+        Function Throws: Nothing
+        Function Returns: (List: The ids the run has not processed yet.)
+        """
+
+        if not self.in_progress():
+            self.state['run'] = {'started': datetime.now().isoformat(timespec='seconds'), 'ids': list(dict.fromkeys(ids)), 'done': []}
+            self.save()
+        done = set(self.state['run']['done'])
+        return [id for id in self.state['run']['ids'] if id not in done]
+
+    def is_unchanged(self, id, digest):
+
+        """
+        Function Description: Check a scorecard against the hash recorded when it was last ingested.
+        Function Parameters: id (Int: The scorecard id.), digest (String: The hash of the fetched scorecard.)
+        Function Throws: Nothing
+        Function Returns: (Boolean: True if the scorecard was ingested with the same content and False otherwise.)
+        """
+
+        return self.state['scorecards'].get(str(id), {}).get('hash') == digest
+
+    def record(self, done, versions):
+
+        """
+        Function Description: Mark scorecards as processed by the run and record the versions that are now stored.
+        Function Parameters: done (List: The ids processed.), versions (Dict: The hash and last modified time stored for each id.)
+        Function Throws: Nothing
+        Function Returns: Nothing
+        """
+
+        self.state['scorecards'].update((str(id), version) for id, version in versions.items())
+        self.state['run']['done'].extend(done)
+        self.save()
+
+    def finish(self):
+
+        """
+        Function Description: Mark the run as finished so the next run starts over from freshly parsed ids.
+        Function Parameters: Nothing
+        Function Throws: Nothing
+        Function Returns: Nothing
+        """
+
+        self.state['run'] = None
+        self.save()
+
+class Quarantine():
+
+    def __init__(self, directory=quarantine_directory):
+
+        """
+        Class Description: Append the scorecards that failed in a run, with their error and payload, to a file of their own.
+        Class Instantiators: directory (Path: Where the quarantine files are kept.)
+        """
+
+        self.location = Path(directory) / 'quarantine_{}.jsonl'.format(datetime.now().strftime('%Y%m%d_%H%M%S'))
+        self.count = 0
+
+    def add(self, id, stage, error, payload=None):
+
+        """
+        Function Description: Append a failed scorecard to the quarantine file.
+        Function Parameters: id (Int: The scorecard id.), stage (String: 'fetch' or 'write'.), error (Exception or String: Why it failed.),
+            payload (Dict: The scorecard document when one was fetched.)
+        Function Throws: Nothing
+        Function Returns: Nothing
+        """
+
+        self.location.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.location, 'a', encoding='utf-8') as f:
+            f.write(dumps({'id': id, 'stage': stage, 'error': str(error), 'payload': payload}, default=str) + '\n')
+        self.count += 1
+
+@instrumented
+def sync_scorecards(session, ids, mongo_conn, checkpoint, quarantine, refresh=False, fetch_options=None, step=checkpoint_every):
+
+    """
+    Function Description: Fetch and write the scorecards a step at a time, checkpointing after each step so a crash resumes where it stopped.
+        Scorecards missing from the collection are always written. A stored scorecard is only rewritten when its content hash and last modified time changed.
+    Function Parameters: session (Session: The HTTP session authenticated with Garmin.), ids (List: The scorecard ids.),
+        mongo_conn (Collection: The connection to the Mongo Collection.), checkpoint (Checkpoint: The ingest checkpoint.),
+        quarantine (Quarantine: Where failed scorecards are kept.), refresh (Boolean: Fetch stored scorecards again to pick up edits.
+        Only missing scorecards are fetched otherwise.), fetch_options (Dict: Passed on to fetch_scorecards.), step (Int: The scorecards between checkpoints.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The number of scorecards inserted, updated, unchanged, skipped and failed.)
+    """
+
+    counts = dict.fromkeys(['inserted', 'updated', 'unchanged', 'skipped', 'failed'], 0)
+    for chunk in chunk_ids(checkpoint.start_run(ids), step):
+        with phase('find_missing') as find:
+            fetch_ids = chunk if refresh else find_missing_ids(chunk, mongo_conn)
+            find.count(docs=len(chunk))
+        counts['skipped'] += len(chunk) - len(fetch_ids)
+        with phase('fetch') as fetch:
+            scorecard_docs, failures = fetch_scorecards(session, fetch_ids, **(fetch_options or {}))
+            fetch.count(docs=len(scorecard_docs))
+        with phase('compare') as compare:
+            stored = stored_modified_times(list(scorecard_docs), mongo_conn) if refresh else {}                 # Missing scorecards are always written.
+            versions, changed = {}, []
+            for id, scorecard_doc in scorecard_docs.items():
+                versions[id] = {'hash': content_hash(scorecard_doc), 'modified': scorecard_modified(scorecard_doc)}
+                if id in stored and (checkpoint.is_unchanged(id, versions[id]['hash']) or (stored[id] is not None and stored[id] == versions[id]['modified'])):
+                    counts['unchanged'] += 1
+                else:
+                    changed.append(scorecard_doc)
+            compare.count(docs=len(scorecard_docs))
+        with phase('write') as write:
+            inserted, replaced, write_failures = bulk_upsert_scorecards(changed, mongo_conn)
+            write.count(docs=len(changed))
+        counts['inserted'] += len(inserted)
+        counts['updated'] += len(replaced)
+        for id, error in failures.items():
+            quarantine.add(id, 'fetch', error)
+        for id, error in write_failures.items():
+            quarantine.add(id, 'write', error, scorecard_docs[id])
+            del versions[id]
+        counts['failed'] += len(failures) + len(write_failures)
+        with phase('checkpoint'):
+            checkpoint.record(chunk, versions)
+    checkpoint.finish()
+    return counts
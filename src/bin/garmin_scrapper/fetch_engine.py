@@ -0,0 +1,181 @@
+# Script Description: Fetch scorecards from Garmin concurrently over a pooled HTTP session under a rate limit.
+# Script Author: Michael Krakovsky
+
+from sys import path
+path.extend('../../../')                                                          # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis.instrumentation import instrumented, phase
+from threading import Lock
+from time import monotonic, sleep
+from concurrent.futures import ThreadPoolExecutor
+from json import loads
+from requests import Session, RequestException
+from requests.adapters import HTTPAdapter
+
+detail_url = 'https://connect.garmin.com/modern/proxy/gcs-golfcommunity/api/v2/scorecard/detail?scorecard-ids={}&include-next-previous-ids=true&user-locale=en'
+retry_statuses = {429, 500, 502, 503, 504}                                        # Statuses worth trying again.
+
+class TokenBucket():
+
+    def __init__(self, rate, capacity=1):
+
+        """
+        Class Description: Limit how many requests are sent per second across every thread.
+        Class Instantiators: rate (Float: The tokens added per second.), capacity (Int: The most tokens that can be saved up for a burst.)
+        """
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = monotonic()
+        self.lock = Lock()
+
+    def acquire(self):
+
+        """
+        Function Description: Block until a token is available and take it.
+        Function Parameters: Nothing
+        Function Throws: Nothing
+        Function Returns: Nothing
+        """
+
+        while True:
+            with self.lock:
+                now = monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            sleep(wait)
+
+def session_from_driver(driver, pool_size=8):
+
+    """
+    Function Description: Lift the cookies of a logged in Selenium session into a pooled HTTP session.
+    Function Parameters: driver (WebBrowser: The logged in Chrome browser.), pool_size (Int: The number of connections kept open.)
+    Function Throws: Nothing
+    Function Returns: (Session: The HTTP session authenticated as the browser.)
+    """
+
+    session = Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = driver.execute_script('return navigator.userAgent;')
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+    return session
+
+def fetch_json(session, url, bucket, retries=3, backoff=1.0, timeout=30):
+
+    """
+    Function Description: Get the body of a url, retrying with an exponential backoff when the request fails.
+    Function Parameters: session (Session: The HTTP session.), url (String: The url to fetch.), bucket (TokenBucket: The rate limit.),
+        retries (Int: The number of retries after the first attempt.), backoff (Float: The seconds waited before the first retry.),
+        timeout (Float: The seconds to wait for Garmin to respond.)
+    Function Throws: RequestException (Every attempt failed.)
+    Function Returns: (String: The body of the response.)
+    """
+
+    for attempt in range(retries + 1):
+        with phase('rate_limit'):
+            bucket.acquire()
+        try:
+            with phase('request'):
+                response = session.get(url, timeout=timeout)
+            if response.status_code not in retry_statuses:
+                response.raise_for_status()
+                return response.text
+            error = RequestException("Garmin responded with status {}.".format(response.status_code), response=response)
+        except RequestException as e:
+            if e.response is not None and e.response.status_code not in retry_statuses:
+                raise
+            error = e
+        if attempt < retries:
+            with phase('backoff'):
+                sleep(backoff * 2 ** attempt)
+    raise error
+
+def split_scorecards(json_text):
+
+    """
+    Function Description: Split the response for many scorecards into one document per scorecard, shaped like the response for a single id.
+    Function Parameters: json_text (String: The body of the scorecard detail response, either as text or already parsed.)
+    Function Throws: ValueError (The body is not JSON or not shaped like a scorecard detail response.)
+    Function Returns: (Dict: The document of each scorecard by id.)
+    """
+
+    response = json_text if isinstance(json_text, dict) else loads(json_text)
+    if not isinstance(response, dict):
+        raise ValueError("The scorecard detail response is a {} rather than an object.".format(type(response).__name__))
+    details = response.get('scorecardDetails') or []
+    snapshots = response.get('courseSnapshots') or []
+    shared = {key: value for key, value in response.items() if key not in ('scorecardDetails', 'courseSnapshots')}
+    documents = {}
+    for detail in details:
+        scorecard = detail.get('scorecard') if isinstance(detail, dict) else None
+        if not isinstance(scorecard, dict):
+            raise ValueError("The scorecard detail response holds a detail without a scorecard.")
+        course_snapshots = [snapshot for snapshot in snapshots if snapshot.get('courseGlobalId') == scorecard.get('courseGlobalId')]
+        documents[scorecard.get('id')] = dict(shared, scorecardDetails=[detail], courseSnapshots=course_snapshots or snapshots)
+    return documents
+
+def chunk_ids(ids, batch_size):
+
+    """
+    Function Description: Split the scorecard ids into batches.
+    Function Parameters: ids (List: The scorecard ids.), batch_size (Int: The most ids in a batch.)
+    Function Throws: Nothing
+    Function Returns: (List: The batches of ids.)
+    """
+
+    ids = list(ids)
+    return [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+
+@instrumented
+def fetch_batch(session, ids, url, bucket, retries=3, backoff=1.0, archive=None):
+
+    """
+    Function Description: Fetch a batch of scorecards with one request.
+    Function Parameters: session (Session: The HTTP session.), ids (List: The scorecard ids in the batch.), url (String: The detail url to format with the ids.),
+        bucket (TokenBucket: The rate limit.), retries (Int: The retries of the request.), backoff (Float: The seconds waited before the first retry.),
+        archive (ScorecardArchive: Where the raw response is kept for replays. Not kept when None.)
+    Function Throws: RequestException (The request failed.), ValueError, KeyError (The response is not a scorecard detail response.)
+    Function Returns: (Tuple: The document of each returned scorecard by id and the error of each scorecard missing from the response by id.)
+    """
+
+    json_text = fetch_json(session, url.format(','.join(str(id) for id in ids)), bucket, retries, backoff)
+    if archive is not None:
+        with phase('archive'):
+            archive.add(json_text)
+    with phase('split') as split:
+        documents = split_scorecards(json_text)
+        split.count(docs=len(documents))
+    missing = {id: ValueError("Garmin did not return scorecard {}.".format(id)) for id in ids if id not in documents}
+    return {id: documents[id] for id in ids if id in documents}, missing
+
+def fetch_scorecards(session, ids, url=detail_url, batch_size=20, rate=2.0, concurrency=4, retries=3, backoff=1.0, archive=None):
+
+    """
+    Function Description: Fetch the detail of many scorecards concurrently, requesting a batch of ids at a time.
+    Function Parameters: session (Session: The HTTP session.), ids (List: The scorecard ids.), url (String: The detail url to format with the ids.),
+        batch_size (Int: The most ids requested at once.), rate (Float: The most requests sent per second.),
+        concurrency (Int: The number of requests in flight.), retries (Int: The retries per request.),
+        backoff (Float: The seconds waited before the first retry.), archive (ScorecardArchive: Where the raw responses are kept for replays.)
+    Function Throws: Nothing
+    Function Returns: (Tuple: The document of each fetched scorecard by id and the error of each failed scorecard by id.)
+    """
+
+    bucket = TokenBucket(rate, capacity=concurrency)
+    results, failures = {}, {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [(batch, pool.submit(fetch_batch, session, batch, url, bucket, retries, backoff, archive)) for batch in chunk_ids(ids, batch_size)]
+        for batch, future in futures:
+            try:
+                documents, missing = future.result()
+            except (RequestException, ValueError, KeyError) as e:
+                documents, missing = {}, {id: e for id in batch}                  # The whole batch failed. The other batches are kept.
+            results.update(documents)
+            failures.update(missing)
+    return results, failures
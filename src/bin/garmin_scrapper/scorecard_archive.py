@@ -0,0 +1,148 @@
+# Script Description: Archive the raw scorecard responses from Garmin and replay an archive into MongoDB without a browser or the network.
+# Script Author: Michael Krakovsky
+
+from sys import path
+path.extend('../../../')                                                                    # Import the entire project.
+from My_Golf_Journey.src.bin.garmin_scrapper.fetch_engine import chunk_ids, split_scorecards
+from My_Golf_Journey.src.bin.garmin_scrapper.scorecard_store import bulk_upsert_scorecards, scorecard_modified
+from My_Golf_Journey.src.bin.stat_apis.instrumentation import instrumented, phase
+from My_Golf_Journey.src.bin.stat_apis.index_advisor import ensure_indexes
+from My_Golf_Journey.src.bin.stat_apis.mongo_connection import close as close_connection, get_scorecards_collection
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from json import load
+from os import cpu_count, replace
+from pathlib import Path
+from threading import get_ident
+from time import perf_counter
+import gzip
+
+archive_directory = Path(__file__).absolute().parent.parent.parent / 'data' / 'scorecard_archive'
+replay_batch_size = 500                                                                     # The scorecards written per bulk write.
+
+class ScorecardArchive():
+
+    def __init__(self, directory=archive_directory):
+
+        """
+        Class Description: Keep every raw scorecard detail response gzipped under the hash of its content, so a response fetched twice is stored once.
+        Class Instantiators: directory (Path: Where the archive is kept.)
+        """
+
+        self.directory = Path(directory)
+
+    def location(self, digest):
+
+        """
+        Function Description: Get the file of a response. Responses are spread over sub directories named after the first two characters of their hash.
+        Function Parameters: digest (String: The hex digest of the response.)
+        Function Throws: Nothing
+        Function Returns: (Path: The gzipped response.)
+        """
+
+        return self.directory / digest[:2] / (digest + '.json.gz')
+
+    def add(self, json_text):
+
+        """
+        Function Description: Archive a response unless the same content is already archived. The file is swapped in so a crash never leaves half a response.
+        Function Parameters: json_text (String: The body of the scorecard detail response.)
+        Function Throws: Nothing
+        Function Returns: (String: The hex digest the response is stored under.)
+        """
+
+        content = json_text.encode('utf-8')
+        digest = sha256(content).hexdigest()
+        location = self.location(digest)
+        if not location.exists():
+            location.parent.mkdir(parents=True, exist_ok=True)
+            temp_location = location.with_name('{}.{}.tmp'.format(location.name, get_ident()))       # Threads fetching the same response write apart.
+            with gzip.open(temp_location, 'wb', compresslevel=6) as f:
+                f.write(content)
+            replace(temp_location, location)
+        return digest
+
+    def paths(self):
+
+        """
+        Function Description: List the archived responses.
+        Function Parameters: Nothing
+        Function Throws: Nothing
+        Function Returns: (List: The paths of the gzipped responses.)
+        """
+
+        return sorted(self.directory.glob('*/*.json.gz'))
+
+def read_archived_response(location):
+
+    """
+    Function Description: Decompress and parse an archived response. Run in the worker processes of a replay.
+    Function Parameters: location (Path: The gzipped response.)
+    Function Throws: Nothing
+    Function Returns: (Tuple: The document of each scorecard in the response by id and the error when the file is unreadable, otherwise None.)
+    """
+
+    try:
+        with gzip.open(location, 'rt', encoding='utf-8') as f:
+            payload = load(f)
+        if not isinstance(payload, dict):
+            return {}, '{}: The response is a {} rather than an object.'.format(location, type(payload).__name__)
+        return split_scorecards(payload), None
+    except (OSError, EOFError, ValueError, KeyError) as e:
+        return {}, '{}: {}'.format(location, e)
+
+@instrumented
+def replay_archive(mongo_conn, directory=archive_directory, workers=None, batch_size=replay_batch_size):
+
+    """
+    Function Description: Load every archived scorecard into MongoDB. The responses are decompressed and parsed over a process pool and the scorecards
+        are upserted in batches, so a replay can be run again safely. When a scorecard was archived more than once the last modified version is kept.
+    Function Parameters: mongo_conn (Collection: The connection to the Mongo Collection.), directory (Path: The archive.),
+        workers (Int: The parsing processes. One per CPU when None.), batch_size (Int: The scorecards written per bulk write.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The number of files read and unreadable, the scorecards found, inserted, updated and failed, and the errors.)
+    """
+
+    locations = ScorecardArchive(directory).paths()
+    counts = {'files': len(locations), 'unreadable': 0, 'scorecards': 0, 'inserted': 0, 'updated': 0, 'failed': 0, 'errors': []}
+    scorecard_docs = {}
+    with phase('read') as read:
+        workers = workers or cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for documents, error in pool.map(read_archived_response, locations, chunksize=max(1, len(locations) // (workers * 4))):
+                if error is not None:
+                    counts['unreadable'] += 1
+                    counts['errors'].append(error)
+                for id, scorecard_doc in documents.items():
+                    if id not in scorecard_docs or (scorecard_modified(scorecard_doc) or '') >= (scorecard_modified(scorecard_docs[id]) or ''):
+                        scorecard_docs[id] = scorecard_doc
+        read.count(docs=len(scorecard_docs))
+    counts['scorecards'] = len(scorecard_docs)
+    for batch in chunk_ids(scorecard_docs, batch_size):
+        with phase('write') as write:
+            inserted, replaced, failures = bulk_upsert_scorecards([scorecard_docs[id] for id in batch], mongo_conn)
+            write.count(docs=len(batch))
+        counts['inserted'] += len(inserted)
+        counts['updated'] += len(replaced)
+        counts['failed'] += len(failures)
+        counts['errors'].extend('Scorecard {}: {}'.format(id, error) for id, error in failures.items())
+    return counts
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description='Rebuild the Scorecards collection from the archived Garmin responses. No browser or network is used.')
+    parser.add_argument('--directory', default=str(archive_directory), help='The archive to replay.')
+    parser.add_argument('--workers', type=int, help='The processes that decompress and parse the responses. One per CPU when not given.')
+    parser.add_argument('--batch-size', type=int, default=replay_batch_size, help='The scorecards written per bulk write.')
+    args = parser.parse_args()
+    start = perf_counter()
+    try:
+        collection = get_scorecards_collection()
+        ensure_indexes(collection)                                                          # Upserts by scorecard id rely on the indexes.
+        counts = replay_archive(collection, args.directory, args.workers, args.batch_size)
+    finally:
+        close_connection()
+    for error in counts['errors']:
+        print(error)
+    print("Replayed {} files holding {} scorecards: inserted {}, updated {}, failed {} and {} files unreadable in {:.1f} seconds.".format(
+        counts['files'], counts['scorecards'], counts['inserted'], counts['updated'], counts['failed'], counts['unreadable'], perf_counter() - start))
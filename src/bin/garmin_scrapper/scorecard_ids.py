@@ -0,0 +1,69 @@
+# Script Description: Stream the scorecard ids out of saved Garmin page sources without reading the pages into memory.
+# Script Author: Michael Krakovsky
+
+from pathlib import Path
+from re import compile
+
+scorecard_id_pattern = compile('data-scorecard-id="(\\d+)"')
+tail_size = 64                                                                      # Longer than any id attribute, so a match cut by a chunk is kept.
+
+def _read_chunks(source, chunk_size):
+
+    """
+    Function Description: Read a page source in chunks.
+    Function Parameters: source (Path, String or Iterable: A saved page dump, the text of a page or the chunks of a page.),
+        chunk_size (Int: The characters read from a file at a time.)
+    Function Throws: Nothing
+    Function Returns: (Generator: The chunks of the page.)
+    """
+
+    if isinstance(source, Path):
+        with open(source, 'r', encoding='utf-8') as f:
+            for chunk in iter(lambda: f.read(chunk_size), ''):
+                yield chunk
+    elif isinstance(source, str):
+        yield source
+    else:
+        yield from source
+
+def source_pages(first_page):
+
+    """
+    Function Description: Find the saved page sources in page order. Paginated dumps are saved beside the first page as <name>_<page>.<suffix>.
+    Function Parameters: first_page (Path: The dump of the first page.)
+    Function Throws: Nothing
+    Function Returns: (List: The paths of the page sources, ordered by their page number rather than their name.)
+    """
+
+    first_page = Path(first_page)
+
+    def page_number(page):
+        suffix = page.stem[len(first_page.stem):].lstrip('_')
+        return (int(suffix) if suffix.isdigit() else 0, page.name)
+
+    return sorted(first_page.parent.glob(first_page.stem + '*' + first_page.suffix), key=page_number)
+
+def iter_score_card_ids(sources, chunk_size=1 << 16):
+
+    """
+    Function Description: Yield every scorecard id found in the page sources once, in the order they are found.
+    Function Parameters: sources (Iterable: The paginated page sources. Each one is a saved page dump (Path), the text of a page (String)
+            or the chunks of a page.),
+        chunk_size (Int: The characters read from a file at a time.)
+    Function Throws: Nothing
+    Function Returns: (Generator: The scorecard ids.)
+    """
+
+    seen = set()
+    for source in sources:
+        tail = ''
+        for chunk in _read_chunks(source, chunk_size):
+            text = tail + chunk
+            end = 0
+            for match in scorecard_id_pattern.finditer(text):
+                end = match.end()
+                id = int(match.group(1))
+                if id not in seen:
+                    seen.add(id)
+                    yield id
+            tail = text[max(end, len(text) - tail_size):]                      # Carry the end of the chunk over in case an id spans the boundary.
@@ -0,0 +1,93 @@
+# Script Description: Check and write scorecards in the Mongo Database in bulk.
+# Script Author: Michael Krakovsky
+
+from sys import path
+path.extend('../../../')                                                                    # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis.hole_rollups import update_rollups
+from My_Golf_Journey.src.bin.stat_apis.query_cache import bump_version
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+
+scorecard_id_path = 'scorecardDetails.scorecard.id'
+scorecard_modified_path = 'scorecardDetails.scorecard.lastModifiedDt'
+
+def scorecard_id(scorecard_doc):
+
+    """
+    Function Description: Get the Garmin id of a scorecard document.
+    Function Parameters: scorecard_doc (Dict: The scorecard document from Garmin.)
+    Function Throws: KeyError, IndexError (The document does not hold a scorecard.)
+    Function Returns: (Int: The scorecard id.)
+    """
+
+    return scorecard_doc['scorecardDetails'][0]['scorecard']['id']
+
+def scorecard_modified(scorecard_doc):
+
+    """
+    Function Description: Get when Garmin last modified a scorecard document.
+    Function Parameters: scorecard_doc (Dict: The scorecard document from Garmin.)
+    Function Throws: KeyError, IndexError (The document does not hold a scorecard.)
+    Function Returns: (String: The last modified time or None when Garmin did not send one.)
+    """
+
+    return scorecard_doc['scorecardDetails'][0]['scorecard'].get('lastModifiedDt')
+
+def stored_modified_times(ids, mongo_conn):
+
+    """
+    Function Description: Get when each stored scorecard was last modified with a single query.
+    Function Parameters: ids (List: The scorecard ids.), mongo_conn (Collection: The connection to the Mongo Collection.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The last modified time of each stored scorecard by id.)
+    """
+
+    stored = {}
+    for scorecard_doc in mongo_conn.find({scorecard_id_path: {'$in': list(ids)}}, {'_id': 0, scorecard_id_path: 1, scorecard_modified_path: 1}):
+        stored.update((detail['scorecard']['id'], detail['scorecard'].get('lastModifiedDt')) for detail in scorecard_doc['scorecardDetails'])
+    return stored
+
+def find_missing_ids(ids, mongo_conn):
+
+    """
+    Function Description: Find the scorecards that are not in the DB yet with a single query.
+    Function Parameters: ids (List: The scorecard ids.), mongo_conn (Collection: The connection to the Mongo Collection.)
+    Function Throws: Nothing
+    Function Returns: (List: The ids that are not stored, in their original order and without duplicates.)
+    """
+
+    ids = list(dict.fromkeys(ids))
+    stored = set()
+    for scorecard_doc in mongo_conn.find({scorecard_id_path: {'$in': ids}}, {'_id': 0, scorecard_id_path: 1}):
+        stored.update(detail['scorecard']['id'] for detail in scorecard_doc['scorecardDetails'])
+    return [id for id in ids if id not in stored]
+
+def bulk_upsert_scorecards(scorecard_docs, mongo_conn):
+
+    """
+    Function Description: Write many scorecards with one unordered bulk write, replacing any stored scorecard with the same id.
+        The per hole rollups are updated with the scorecards that are new or edited and the cached stats are invalidated.
+    Function Parameters: scorecard_docs (List: The scorecard documents from Garmin.), mongo_conn (Collection: The connection to the Mongo Collection.)
+    Function Throws: Nothing
+    Function Returns: (Tuple: The ids inserted, the ids replaced and the error of each id that failed.)
+    """
+
+    scorecard_docs = list(scorecard_docs)
+    if not scorecard_docs:
+        return [], [], {}
+    ids = [scorecard_id(scorecard_doc) for scorecard_doc in scorecard_docs]
+    previous = {scorecard_id(scorecard_doc): scorecard_doc for scorecard_doc in mongo_conn.find({scorecard_id_path: {'$in': ids}})}
+    failed = {}
+    try:
+        mongo_conn.bulk_write([ReplaceOne({scorecard_id_path: id}, scorecard_doc, upsert=True)
+            for id, scorecard_doc in zip(ids, scorecard_docs)], ordered=False)
+    except BulkWriteError as e:
+        failed = {ids[error['index']]: error['errmsg'] for error in e.details.get('writeErrors', [])}
+    inserted = [id for id in ids if id not in previous and id not in failed]                     # The scorecards stored before the write were replaced.
+    replaced = [id for id in ids if id in previous and id not in failed]
+    update_rollups([previous[id] for id in replaced], mongo_conn, sign=-1)                      # Take the old rounds out before adding the edited ones.
+    written = set(inserted) | set(replaced)
+    update_rollups([scorecard_doc for id, scorecard_doc in zip(ids, scorecard_docs) if id in written], mongo_conn)
+    if inserted or replaced:
+        bump_version(mongo_conn)                                                          # Cached stats are stale once the scorecards change.
+    return inserted, replaced, failed
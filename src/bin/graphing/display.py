@@ -1,15 +1,325 @@
 # Description: Display the data from the golf database in a productive manner.
 # Author: Michael Krakovsky
 
+from sys import path
+path.extend('../../../../')                      # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis.get_golf_stats import Stats, trend_columns, trend_stats
+from My_Golf_Journey.src.bin.stat_apis.query_cache import QueryCache, current_version
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from matplotlib.figure import Figure
+from matplotlib.ticker import PercentFormatter
+from numpy import arange
+
+hole_charts = {
+    'score': ('scoring_average', 'Scoring Average vs Par', 'Strokes'),
+    'putts': ('putting_average', 'Putting Average', 'Putts'),
+    'fir': ('fairway_accuracy', 'Fairways Hit', 'Accuracy'),
+    'gir': ('green_accuracy', 'Greens in Regulation', 'Accuracy')
+}                                                                       # The column, title and axis label of each per hole chart.
+trend_charts = {'score': ('Score', 'Strokes'), 'putts': ('Putts', 'Putts'), 'fir': ('Fairways Hit', 'Accuracy'), 'gir': ('Greens in Regulation', 'Accuracy')}
+accuracy_stats = ['fir', 'gir']
+chart_directory = Path(__file__).absolute().parent.parent.parent / 'data' / 'charts'
+max_trend_points = 200                                                  # Longer histories are averaged down to this many points.
+
+def hole_plot_data(summary):
+
+    """
+    Function Description: Keep the columns of a course summary that are charted per hole, as floats so missing values plot as gaps.
+    Function Parameters: summary (DataFrame: The course summary indexed by hole, as returned by Stats.get_course_summary.)
+    Function Throws: Nothing
+    Function Returns: (DataFrame: The scoring average, par, putting average and fairway and green accuracy by hole.)
+    """
+
+    return summary[['scoring_average', 'Par', 'putting_average', 'fairway_accuracy', 'green_accuracy']].astype(float)
+
+def course_trends(trend, window):
+
+    """
+    Function Description: Recompute the moving averages of a trend spanning many courses so each course has its own.
+    Function Parameters: trend (DataFrame: The rounds of many courses, as returned by Stats.get_rolling_trend.), window (Int: The number of rounds in each moving average.)
+    Function Throws: Nothing
+    Function Returns: (DataFrame: The same rounds with the moving averages taken within each course.)
+    """
+
+    rounds = trend[trend_columns]
+    averages = rounds.groupby('course_id')[trend_stats].rolling(window, min_periods=1).mean().reset_index(level=0, drop=True)
+    return rounds.join(averages.add_suffix('_avg'))
+
+def downsample(trend, max_points=max_trend_points):
+
+    """
+    Function Description: Average consecutive rounds into at most max_points buckets. The shape of a long trend is kept while the points drawn stay bounded.
+    Function Parameters: trend (DataFrame: The rounds in the order they were played.), max_points (Int: The most points kept.)
+    Function Throws: Nothing
+    Function Returns: (DataFrame: The trend, bucketed when it has more rounds than max_points. Each bucket is dated by its last round.)
+    """
+
+    if len(trend) <= max_points:
+        return trend
+    buckets = arange(len(trend)) * max_points // len(trend)
+    stats = [column for column in trend.columns if column not in ('scorecard_id', 'course_id', 'start_time')]
+    aggregations = dict({column: 'mean' for column in stats}, scorecard_id='last', course_id='last', start_time='last')
+    return trend.groupby(buckets).agg(aggregations)[list(trend.columns)].reset_index(drop=True)
+
+def draw_holes(ax, holes, stat='score'):
+
+    """
+    Function Description: Draw a per hole bar chart on a set of axes. The scoring chart marks the par of each hole.
+    Function Parameters: ax (Axes: Where to draw.), holes (DataFrame: The output of hole_plot_data.), stat (String: 'score', 'putts', 'fir' or 'gir'.)
+    Function Throws: KeyError (The stat is not charted.)
+    Function Returns: (Axes: The axes drawn on.)
+    """
+
+    column, title, label = hole_charts[stat]
+    ax.bar(holes.index, holes[column], color='tab:blue', label=label)
+    if stat == 'score':
+        ax.scatter(holes.index, holes['Par'], marker='_', s=300, color='tab:red', zorder=3, label='Par')
+        ax.legend(loc='lower right')
+    if stat in accuracy_stats:
+        ax.set_ylim(0, 1)
+        ax.yaxis.set_major_formatter(PercentFormatter(1.0))
+    ax.set_xticks(holes.index)
+    ax.set_xlabel('Hole')
+    ax.set_ylabel(label)
+    ax.set_title(title)
+    return ax
+
+def draw_trend(ax, trend, stat='score', window=5):
+
+    """
+    Function Description: Draw a stat over time on a set of axes, each round as a point under its moving average.
+    Function Parameters: ax (Axes: Where to draw.), trend (DataFrame: The rounds with their moving averages.), stat (String: 'score', 'putts', 'fir' or 'gir'.),
+        window (Int: The number of rounds in the moving average, for the legend.)
+    Function Throws: KeyError (The stat is not charted.)
+    Function Returns: (Axes: The axes drawn on.)
+    """
+
+    title, label = trend_charts[stat]
+    ax.plot(trend['start_time'], trend[stat], '.', color='tab:gray', alpha=0.4, label='Round')
+    ax.plot(trend['start_time'], trend[stat + '_avg'], color='tab:blue', label='Moving Average: N={}'.format(window))
+    if stat in accuracy_stats:
+        ax.set_ylim(0, 1)
+        ax.yaxis.set_major_formatter(PercentFormatter(1.0))
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.set_ylabel(label)
+    ax.set_title(title)
+    ax.legend(loc='best')
+    return ax
+
+def holes_figure(holes, title=''):
+
+    """
+    Function Description: Lay the four per hole charts out on one figure. The figure is built without pyplot so it can be rendered in any thread or process.
+    Function Parameters: holes (DataFrame: The output of hole_plot_data.), title (String: The title of the figure.)
+    Function Throws: Nothing
+    Function Returns: (Figure: The figure.)
+    """
+
+    figure = Figure(figsize=(14, 9), layout='constrained')
+    for ax, stat in zip(figure.subplots(2, 2).flat, hole_charts):
+        draw_holes(ax, holes, stat)
+    figure.suptitle(title, fontsize=16)
+    return figure
+
+def trend_figure(trend, window=5, title=''):
+
+    """
+    Function Description: Lay the four trend lines out on one figure.
+    Function Parameters: trend (DataFrame: The rounds with their moving averages.), window (Int: The number of rounds in each moving average.), title (String: The title of the figure.)
+    Function Throws: Nothing
+    Function Returns: (Figure: The figure.)
+    """
+
+    figure = Figure(figsize=(14, 9), layout='constrained')
+    for ax, stat in zip(figure.subplots(2, 2, sharex=True).flat, trend_charts):
+        draw_trend(ax, trend, stat, window)
+    figure.suptitle(title, fontsize=16)
+    return figure
+
+def render_course_files(course_id, holes, trend, directory, window=5, image_format='png'):
+
+    """
+    Function Description: Save the per hole and trend figures of a course. Run in the worker processes of Grapher.render_all_courses.
+    Function Parameters: course_id (Int: The course id.), holes (DataFrame: The output of hole_plot_data.), trend (DataFrame: The rounds with their moving averages.),
+        directory (Path: Where to save the figures.), window (Int: The number of rounds in each moving average.), image_format (String: The image format such as 'png' or 'svg'.)
+    Function Throws: Nothing
+    Function Returns: (List: The paths of the files saved. A figure without data is not saved.)
+    """
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    saved = []
+    if not holes.empty:
+        saved.append(directory / '{}_holes.{}'.format(course_id, image_format))
+        holes_figure(holes, 'Course {}: By Hole'.format(course_id)).savefig(saved[-1])
+    if not trend.empty:
+        saved.append(directory / '{}_trend.{}'.format(course_id, image_format))
+        trend_figure(trend, window, 'Course {}: Over Time'.format(course_id)).savefig(saved[-1])
+    return saved
+
 class Grapher():
 
-    def __init__(self):
+    def __init__(self, stats=None, max_points=max_trend_points, plot_cache=None):
+
+        """
+        Class Description: Organise all modules pertaining to graphing the golf data. Charts are drawn from the Stats getters and the derived
+            plot data is cached until a new scorecard is loaded.
+        Class Instantiators: stats (Stats: Where the data is read. A Stats over MongoDB when None.), max_points (Int: The most points drawn on a trend line.),
+            plot_cache (QueryCache: Holds the derived plot data. An in-memory cache of 64 entries when None.)
+        """
+
+        self.stats = stats if stats is not None else Stats()
+        self.max_points = max_points
+        self.plot_cache = plot_cache if plot_cache is not None else QueryCache(max_entries=64)
+
+    def _version(self):
+
+        """
+        Function Description: Get a stamp that changes whenever the data behind the charts changes.
+        Function Parameters: Nothing
+        Function Throws: Nothing
+        Function Returns: (Int: The scorecards version, or the hole count of the local cache which only grows on refresh.)
+        """
+
+        if self.stats.source == 'cache':
+            return len(self.stats.holes)
+        return current_version(self.stats.collection)
+
+    def _cached(self, key, build):
+
+        """
+        Function Description: Read plot data from the plot cache, building and storing it on a miss.
+        Function Parameters: key (Tuple: Identifies the plot data.), build (Function: Builds the plot data.)
+        Function Throws: Nothing
+        Function Returns: (Object: The plot data.)
+        """
+
+        key, version = repr(key), self._version()
+        hit, value = self.plot_cache.get(key, version)
+        if not hit:
+            value = build()
+            self.plot_cache.put(key, version, value)
+        return value
+
+    def hole_data(self, course_id, holes=18, start=None, end=None):
+
+        """
+        Function Description: Get the per hole plot data of a course.
+        Function Parameters: course_id (Int: The course id.), holes (Int: The number of holes completed in the round used to find the pars.),
+            start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The output of hole_plot_data.)
+        """
+
+        return self._cached(('holes', course_id, holes, start, end), lambda: hole_plot_data(self.stats.get_course_summary(course_id, holes, start, end)))
+
+    def trend_data(self, course_id=None, window=5, holes=18, start=None, end=None):
+
+        """
+        Function Description: Get the trend plot data of a course, downsampled to at most max_points rounds.
+        Function Parameters: course_id (Int: The course id. Every course forms one trend when None.), window (Int: The number of rounds in each moving average.),
+            holes (Int: Only include rounds of this length. Every round when None.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The rounds with their moving averages.)
+        """
+
+        return self._cached(('trend', course_id, window, holes, start, end, self.max_points),
+            lambda: downsample(self.stats.get_rolling_trend(course_id, window, holes, start, end), self.max_points))
+
+    def plot_holes(self, course_id, stat='score', ax=None, holes=18, start=None, end=None):
+
+        """
+        Function Description: Draw a per hole bar chart of a course.
+        Function Parameters: course_id (Int: The course id.), stat (String: 'score', 'putts', 'fir' or 'gir'.), ax (Axes: Where to draw. A new figure when None.),
+            holes (Int: The number of holes completed in the round used to find the pars.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: KeyError (The stat is not charted.)
+        Function Returns: (Axes: The axes drawn on.)
+        """
+
+        ax = ax if ax is not None else Figure(figsize=(8, 5), layout='constrained').subplots()
+        return draw_holes(ax, self.hole_data(course_id, holes, start, end), stat)
+
+    def plot_trend(self, course_id=None, stat='score', ax=None, window=5, holes=18, start=None, end=None):
+
+        """
+        Function Description: Draw a stat of a course over time.
+        Function Parameters: course_id (Int: The course id. Every course forms one trend when None.), stat (String: 'score', 'putts', 'fir' or 'gir'.),
+            ax (Axes: Where to draw. A new figure when None.), window (Int: The number of rounds in each moving average.), holes (Int: Only include rounds of this length.),
+            start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: KeyError (The stat is not charted.)
+        Function Returns: (Axes: The axes drawn on.)
+        """
+
+        ax = ax if ax is not None else Figure(figsize=(8, 5), layout='constrained').subplots()
+        return draw_trend(ax, self.trend_data(course_id, window, holes, start, end), stat, window)
+
+    def render_course(self, course_id, directory, window=5, holes=18, start=None, end=None, image_format='png'):
+
+        """
+        Function Description: Save the per hole and trend figures of a course.
+        Function Parameters: course_id (Int: The course id.), directory (Path: Where to save the figures.), window (Int: The number of rounds in each moving average.),
+            holes (Int: The round length charted.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.),
+            image_format (String: The image format such as 'png' or 'svg'.)
+        Function Throws: Nothing
+        Function Returns: (List: The paths of the files saved.)
+        """
+
+        return render_course_files(course_id, self.hole_data(course_id, holes, start, end), self.trend_data(course_id, window, holes, start, end),
+            directory, window, image_format)
+
+    def course_plot_data(self, course_ids=None, window=5, holes=18, start=None, end=None):
+
+        """
+        Function Description: Get the plot data of many courses with two queries, one for every course summary and one for every round.
+        Function Parameters: course_ids (List: The course ids. Every course when None.), window (Int: The number of rounds in each moving average.),
+            holes (Int: The round length charted.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (Dict: The per hole and the downsampled trend plot data of each course by id.)
+        """
+
+        course_ids = self.stats.get_course_ids() if course_ids is None else list(course_ids)
+
+        def build():
+            summaries = self.stats.get_course_summaries(course_ids, holes, start, end)
+            trends = course_trends(self.stats.get_rolling_trend(course_ids, window, holes, start, end), window)
+            played = set(summaries.index.get_level_values('course_id'))
+            plot_data = {}
+            for course_id in course_ids:
+                summary = summaries.xs(course_id, level='course_id') if course_id in played else summaries.iloc[:0].droplevel('course_id')
+                trend = trends[trends['course_id'] == course_id].reset_index(drop=True)
+                plot_data[course_id] = (hole_plot_data(summary), downsample(trend, self.max_points))
+            return plot_data
+
+        return self._cached(('courses', tuple(course_ids), window, holes, start, end, self.max_points), build)
+
+    def render_all_courses(self, directory, course_ids=None, window=5, holes=18, start=None, end=None, image_format='png', workers=None):
 
         """
-        Class Description: Organise all modules pertaining to graphing the golf data.
-        Class Instantiators: Nothing
+        Function Description: Save the figures of every course. The plot data is read in the calling process and the figures are drawn and saved
+            over a process pool, so the workers never touch MongoDB.
+        Function Parameters: directory (Path: Where to save the figures.), course_ids (List: The course ids. Every course when None.),
+            window (Int: The number of rounds in each moving average.), holes (Int: The round length charted.), start (Date: The earliest round to include.),
+            end (Date: The round start time to stop before.), image_format (String: The image format such as 'png' or 'svg'.),
+            workers (Int: The rendering processes. One per CPU when None.)
+        Function Throws: Nothing
+        Function Returns: (Dict: The paths of the files saved for each course by id.)
         """
 
-        pass
+        plot_data = self.course_plot_data(course_ids, window, holes, start, end)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {course_id: pool.submit(render_course_files, course_id, holes_df, trend, directory, window, image_format)
+                for course_id, (holes_df, trend) in plot_data.items()}
+            return {course_id: future.result() for course_id, future in futures.items()}
 
-    
\ No newline at end of file
+if __name__ == "__main__":
+    parser = ArgumentParser(description='Render the per hole and trend charts of every course to files.')
+    parser.add_argument('--directory', default=str(chart_directory), help='Where to save the charts.')
+    parser.add_argument('--source', default='rollups', help="The Stats source: 'mongo', 'rollups' or 'cache'.")
+    parser.add_argument('--window', type=int, default=5, help='The number of rounds in each moving average.')
+    parser.add_argument('--format', default='png', help='The image format such as png or svg.')
+    parser.add_argument('--workers', type=int, help='The rendering processes. One per CPU when not given.')
+    args = parser.parse_args()
+    saved = Grapher(Stats(source=args.source)).render_all_courses(args.directory, window=args.window, image_format=args.format, workers=args.workers)
+    print("Rendered {} charts for {} courses into {}.".format(sum(len(files) for files in saved.values()), len(saved), args.directory))
@@ -3,23 +3,130 @@
 
 from sys import path
 path.extend('../../../../')                      # Import the entire project.
-from My_Golf_Journey.config import mongo_config
-from pymongo import MongoClient
-from pandas import DataFrame, to_numeric
-from numpy import float16
+from pandas import DataFrame, Index, MultiIndex, Series, concat, json_normalize, to_datetime, to_numeric
+from numpy import asarray, isnan, select
+from concurrent.futures import ThreadPoolExecutor
+from My_Golf_Journey.src.bin.stat_apis.hole_cache import HoleCache
+from My_Golf_Journey.src.bin.stat_apis.hole_records import green_schema, load_records
+from My_Golf_Journey.src.bin.stat_apis.instrumentation import instrumented, phase
+from My_Golf_Journey.src.bin.stat_apis.mongo_connection import get_scorecards_collection
+from My_Golf_Journey.src.bin.stat_apis.query_cache import cached_stat
+
+fairway_outcome = {'$ifNull': ['$scorecardDetails.scorecard.holes.fairwayShotOutcome', 'NO_ENTRY']}      # Holes without a recorded tee shot have no outcome.
+no_fairway_outcomes = ['NO_ENTRY', 'NO_FAIRWAY']                                                         # Outcomes that are not a fairway attempt.
+summary_columns = ['putting_average', 'scoring_average', 'Par', 'fairway_hit_count', 'fairway_attempt', 'fairway_accuracy',
+    'green_hit_count', 'green_attempt', 'green_accuracy']                                                   # The per hole course summary.
+trend_columns = ['scorecard_id', 'course_id', 'start_time', 'score', 'putts', 'fir', 'gir']                 # The per round stats of the rolling trend.
+trend_stats = ['score', 'putts', 'fir', 'gir']
+
+def _time_string(value):
+
+    """
+    Function Description: Convert a date bound into the ISO string format the scorecard start times are stored in.
+    Function Parameters: value (Date, Datetime or String: The bound.)
+    Function Throws: Nothing
+    Function Returns: (String: The bound as an ISO string.)
+    """
+
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+def round_filter(course_id=None, start=None, end=None):
+
+    """
+    Function Description: Build the $match condition selecting the rounds of a course played within a date range.
+    Function Parameters: course_id (Int or List: The course id or ids. Every course when None.), start (Date: The earliest start time to include.),
+        end (Date: The start time to stop before. The range is open ended when a bound is None.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The condition.)
+    """
+
+    if course_id is None:
+        condition = {}
+    elif isinstance(course_id, (list, tuple, set)):
+        condition = {"courseSnapshots.courseGlobalId": {"$in": list(course_id)}}
+    else:
+        condition = {"courseSnapshots.courseGlobalId": course_id}
+    start_time = {}
+    if start is not None:
+        start_time["$gte"] = _time_string(start)
+    if end is not None:
+        start_time["$lt"] = _time_string(end)                                 # Start times are ISO strings, so they compare in date order.
+    if start_time:
+        condition["scorecardDetails.scorecard.startTime"] = start_time
+    return condition
 
 class Stats():
 
-    def __init__(self):
+    def __init__(self, source='mongo', cache=None, collection=None, query_cache=None):
 
         """
         Class Description: Retrieve stats from the MongoDB to perform future analysis.
-        Class Instantiators: Nothing
+        Class Instantiators: source (String: 'mongo' to aggregate every round, 'rollups' to read the per hole rollups kept up to date on insert
+                or 'cache' to compute the stats offline from the local hole cache.),
+            cache (HoleCache: The local hole cache. The default location is used when not given.),
+            collection (Collection: The Scorecards collection to query. The shared connection is looked up on every query when not given,
+                so the object keeps working after the connection is closed or configured.),
+            query_cache (QueryCache: Memoizes the getters until the ingester loads a new scorecard. Nothing is cached when not given.)
+        Class Throws: ValueError (An unknown source is given.)
         """
 
-        client = MongoClient(mongo_config['conn_str'])
-        db = client.Golf_Stats_DB
-        self.collection = db.Scorecards
+        if source not in ('mongo', 'rollups', 'cache'):
+            raise ValueError("Unknown stats source {}. Expected 'mongo', 'rollups' or 'cache'.".format(source))
+        self._collection = collection
+        self._rollups = None
+        self.source = source
+        self.query_cache = query_cache
+        self.cache = cache if cache is not None else HoleCache()
+        self.holes = self.cache.load() if source == 'cache' else None
+
+    @property
+    def collection(self):
+
+        """
+        Function Description: Get the Scorecards collection. Every Stats object shares one client and its pool unless a collection was given.
+        Function Parameters: Nothing
+        Function Throws: Nothing
+        Function Returns: (Collection: The Scorecards collection.)
+        """
+
+        return self._collection if self._collection is not None else get_scorecards_collection()
+
+    @collection.setter
+    def collection(self, collection):
+
+        self._collection = collection
+
+    @property
+    def rollups(self):
+
+        """
+        Function Description: Get the per hole rollups collection beside the Scorecards collection.
+        Function Parameters: Nothing
+        Function Throws: Nothing
+        Function Returns: (Collection: The HoleRollups collection.)
+        """
+
+        return self._rollups if self._rollups is not None else self.collection.database.HoleRollups
+
+    @rollups.setter
+    def rollups(self, rollups):
+
+        self._rollups = rollups
+
+    @instrumented
+    def refresh_cache(self):
+
+        """
+        Function Description: Add the scorecards played since the cache watermark to the local hole cache and reload it.
+        Function Parameters: Nothing
+        Function Throws: Nothing
+        Function Returns: (Int: The number of hole records added to the cache.)
+        """
+
+        added = self.cache.refresh(self.collection)
+        if self.source == 'cache':
+            self.holes = self.cache.load()
+        return added
 
     def get_aggregate(self, query):
 
@@ -32,47 +139,133 @@ class Stats():
 
         return self.collection.aggregate(query)
 
-    def get_putting_avg_by_hole(self, course_id):
+    def _read_aggregate(self, query):
+
+        """
+        Function Description: Run a query and read every document it returns, timing the aggregation and the transfer as phases of the getter.
+        Function Parameters: query (List: A query.)
+        Function Throws: Nothing
+        Function Returns: (List: The documents returned.)
+        """
+
+        with phase('aggregate'):
+            cursor = self.collection.aggregate(query)                       # Returns once the first batch is ready.
+        with phase('transfer') as transfer:
+            docs = list(cursor)
+            transfer.count(docs=len(docs))
+        return docs
+
+    def _read_rollups(self, query, projection):
+
+        """
+        Function Description: Read the rollups matching a filter, timed as a phase of the getter.
+        Function Parameters: query (Dict: The filter.), projection (Dict: The fields to return.)
+        Function Throws: Nothing
+        Function Returns: (List: The rollup documents.)
+        """
+
+        with phase('rollups') as read:
+            docs = list(self.rollups.find(query, projection))
+            read.count(docs=len(docs))
+        return docs
+
+    def get_queries(self, course_id, holes=18, start=None, end=None):
+
+        """
+        Function Description: Get the MongoDB query run by each getter for a course, so their query plans can be inspected.
+        Function Parameters: course_id (Int: The course id.), holes (Int: The number of holes completed in the round used to find the pars.),
+            start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (Dict: The query of each getter by name.)
+        """
+
+        return {
+            'get_putting_avg_by_hole': self._putting_avg_query(course_id, start, end),
+            'get_scoring_avg_by_hole': self._scoring_avg_query(course_id, start, end),
+            'get_hole_pars': self._hole_pars_query(course_id, holes),
+            'get_fairways': self._fairways_query(course_id, start, end),
+            'get_fairway_accuracy': self._fairway_accuracy_query(course_id, start, end),
+            'get_green_accuracy': self._greens_by_hole_query(course_id, start, end),
+            'get_course_summary': self._course_summary_query(course_id, holes, start, end),
+            'get_course_summaries': self._course_summaries_query([course_id], holes, start, end),
+            'get_rolling_trend': self._rolling_trend_query(course_id, 5, holes, start, end)
+        }
+
+    @instrumented
+    @cached_stat
+    def get_putting_avg_by_hole(self, course_id, start=None, end=None):
 
         """
         Function Description: Get the putting average by the hole at a particular golf course.
-        Function Parameters: coourse_id (Int: The unique id to identify the golf course.)
+        Function Parameters: coourse_id (Int: The unique id to identify the golf course.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
         Function Throws: Nothing
         Function Returns: (DataFrame: The collection of hole numbers and putts per hole.)
         """
 
-        df = DataFrame(list(self.collection.aggregate([
-            {"$match": {"courseSnapshots.courseGlobalId": course_id}},
+        if self._is_precomputed(start, end):
+            return self._get_precomputed_summary(course_id, start, end)[['putting_average']]
+
+        df = DataFrame(self._read_aggregate(self._putting_avg_query(course_id, start, end)), columns=['_id', 'putting_average'])
+        return df.set_index('_id')
+
+    def _putting_avg_query(self, course_id, start=None, end=None):
+
+        """
+        Function Description: Build the query that averages the putts of each hole.
+        Function Parameters: course_id (Int: The course id.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (List: The MongoDB query.)
+        """
+
+        return [
+            {"$match": round_filter(course_id, start, end)},
             {"$unwind": "$scorecardDetails"},
             {"$sort": {"scorecardDetails.scorecard.startTime" : 1}},
             {"$unwind": "$scorecardDetails.scorecard.holes"}, 
             {"$group": {"_id": "$scorecardDetails.scorecard.holes.number",
                 "putting_average": {"$avg": "$scorecardDetails.scorecard.holes.putts"}}},
             {'$sort': {"_id": 1}}
-        ])))
-        return df.set_index('_id')
+        ]
 
-    def get_scoring_avg_by_hole(self, course_id):
+    @instrumented
+    @cached_stat
+    def get_scoring_avg_by_hole(self, course_id, start=None, end=None):
 
         """
         Function Description: Get the scoring average by the hole at a particular golf course.
-        Function Parameters: coourse_id (Int: The unique id to identify the golf course.)
+        Function Parameters: coourse_id (Int: The unique id to identify the golf course.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
         Function Throws: Nothing
         Function Returns: (List: The collection of hole numbers and putts per hole.)
         """
 
-        df = DataFrame(list(self.collection.aggregate([
-            {"$match": {"courseSnapshots.courseGlobalId": course_id}},
+        if self._is_precomputed(start, end):
+            return self._get_precomputed_summary(course_id, start, end)[['scoring_average', 'Par']]
+
+        df = DataFrame(self._read_aggregate(self._scoring_avg_query(course_id, start, end)), columns=['_id', 'scoring_average'])
+        df = df.set_index('_id')
+        return df.join(self.get_hole_pars(course_id))
+
+    def _scoring_avg_query(self, course_id, start=None, end=None):
+
+        """
+        Function Description: Build the query that averages the strokes of each hole.
+        Function Parameters: course_id (Int: The course id.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (List: The MongoDB query.)
+        """
+
+        return [
+            {"$match": round_filter(course_id, start, end)},
             {"$unwind": "$scorecardDetails"},
             {"$sort": {"scorecardDetails.scorecard.startTime" : 1}},
             {"$unwind": "$scorecardDetails.scorecard.holes"}, 
             {"$group": {"_id": "$scorecardDetails.scorecard.holes.number",
                 "scoring_average": {"$avg": "$scorecardDetails.scorecard.holes.strokes"}}}, 
             {'$sort': {"_id": 1}}
-        ])))
-        df = df.set_index('_id')
-        return df.join(self.get_hole_pars(course_id))
+        ]
 
+    @instrumented
+    @cached_stat
     def get_hole_pars(self, course_id, holes=18):
 
         """
@@ -82,19 +275,46 @@ class Stats():
         Function Returns: (Dataframe: A dataframe of all holes and there respective pars.)
         """
 
-        hole_pars = list(self.collection.aggregate([
-	        {"$match": {"courseSnapshots.courseGlobalId": course_id,
-             "scorecardDetails.scorecard.holesCompleted" : holes}},
-	        {"$unwind": "$courseSnapshots"},
-	        {"$project": {"_id": 0, "holePars": "$courseSnapshots.holePars"}}
-	        ]))[0]
-        return DataFrame({hole + 1 : par for hole, par in enumerate(hole_pars['holePars'])}.items(), columns=['Hole', 'Par']).set_index('Hole').astype(float16)
+        if self.source != 'mongo':
+            return self._get_precomputed_summary(course_id)[['Par']].rename_axis('Hole')
 
-    def get_fairways(self, course_id):
+        hole_pars = self._read_aggregate(self._hole_pars_query(course_id, holes))[0]
+        return self._pars_to_frame(hole_pars['holePars'])
+
+    def _hole_pars_query(self, course_id, holes):
+
+        """
+        Function Description: Build the query that finds the pars of a course from a round of the given length.
+        Function Parameters: course_id (Int: The course id.), holes (Int: The number of holes completed in the round.)
+        Function Throws: Nothing
+        Function Returns: (List: The MongoDB query.)
+        """
+
+        return [
+            {"$match": {"courseSnapshots.courseGlobalId": course_id,
+                "scorecardDetails.scorecard.holesCompleted" : holes}},
+            {"$unwind": "$courseSnapshots"},
+            {"$project": {"_id": 0, "holePars": "$courseSnapshots.holePars"}}
+        ]
+
+    def _pars_to_frame(self, hole_pars):
+
+        """
+        Function Description: Organise the pars stored in a course snapshot by their hole number.
+        Function Parameters: hole_pars (String or List: The par of each hole in order starting at hole one.)
+        Function Throws: Nothing
+        Function Returns: (Dataframe: A dataframe of all holes and there respective pars.)
+        """
+
+        return DataFrame({hole + 1 : int(par) for hole, par in enumerate(hole_pars)}.items(), columns=['Hole', 'Par']).set_index('Hole').astype('UInt8')
+
+    @instrumented
+    @cached_stat
+    def get_fairways(self, course_id, start=None, end=None):
 
         """
         Function Description: Get the count of Fairways hit and missed.
-        Function Parameters: course_id (Int: The course id.)
+        Function Parameters: course_id (Int: The course id.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
         Function Throws: Nothing
         Function Returns: (DataFrame: The organised data containing the results.)
 
@@ -102,11 +322,23 @@ class Stats():
                 1     LEFT     4     35
         """
 
-        rounds = list(self.collection.aggregate([                                                                             # Filter the information pertaining to Fairways Hit.
+        if self._is_precomputed(start, end):
+            return self._get_precomputed_fairways(course_id, start, end)
+
+        return DataFrame(self._read_aggregate(self._fairways_query(course_id, start, end)), columns=['outcome', 'hole', 'count'])   # Filter the information pertaining to Fairways Hit.
+
+    def _fairways_query(self, course_id, start=None, end=None):
+
+        """
+        Function Description: Build the query that counts the outcome of every fairway attempt by hole.
+        Function Parameters: course_id (Int: The course id.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (List: The MongoDB query.)
+        """
+
+        return [
             {
-                '$match': {
-                    'courseSnapshots.courseGlobalId': course_id
-                }
+                '$match': round_filter(course_id, start, end)
             }, {
                 '$unwind': {
                     'path': '$scorecardDetails'
@@ -118,63 +350,96 @@ class Stats():
             }, {
                 '$group': {
                     '_id': {
-                        'outcome': '$scorecardDetails.scorecard.holes.fairwayShotOutcome', 
+                        'outcome': fairway_outcome,
                         'hole': '$scorecardDetails.scorecard.holes.number'
                     }, 
                     'count': {
                         '$sum': 1
                     }
                 }
+            }, {
+                '$match': {
+                    '_id.outcome': {'$nin': no_fairway_outcomes}                                                              # Filter out records that do not apply.
+                }
+            }, {
+                '$project': {
+                    '_id': 0, 
+                    'outcome': '$_id.outcome', 
+                    'hole': '$_id.hole', 
+                    'count': 1
+                }
             }
-        ]))
-        new_rounds = []                                                                                                       # Clean the data for missing data.
-        for el in rounds:
-            if 'outcome' in el['_id']:
-                new_rounds.append({'outcome': el['_id']['outcome'], 'hole': el['_id']['hole'], 'count': el['count']})
-            else:
-                new_rounds.append({'outcome': 'NO_ENTRY', 'hole': el['_id']['hole'], 'count': el['count']})
-        rounds = DataFrame(new_rounds)
-        return rounds[(rounds['outcome'] != "NO_ENTRY") & (rounds['outcome'] != "NO_FAIRWAY")]
-
-    def get_fairway_accuracy(self, course_id):
+        ]
+
+    @instrumented
+    @cached_stat
+    def get_fairway_accuracy(self, course_id, start=None, end=None):
         
         """
         Function Description: Get the Fairway Accuracy of each hole at a course.
-        Function Parameters: course_id (Int: The course id of the course.)
+        Function Parameters: course_id (Int: The course id of the course.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
         Function Throws: Nothing
         Function Returns: (DataFrame: The data containing the fairways hit.)
 
                 count  HIT_Count  Accuracy
-            hole                            
-            1       134       61.0  0.455224
+            _id                            
+            1       134         61  0.455224
 
         """
+
+        if self._is_precomputed(start, end):
+            df = self._get_precomputed_summary(course_id, start, end)
+            df = df[df['fairway_attempt'] > 0][['fairway_attempt', 'fairway_hit_count', 'fairway_accuracy']]
+            return df.rename(columns={'fairway_attempt': 'count', 'fairway_hit_count': 'HIT_Count', 'fairway_accuracy': 'Accuracy'})
         
-        rounds = self.get_fairways(course_id)
-        rounds = rounds[(rounds['outcome'] != "NO_ENTRY") & (rounds['outcome'] != "NO_FAIRWAY")]        # Filter out records that do not apply.
-        new_rounds = rounds.groupby(by=["hole"]).sum()
-        for index, row in new_rounds.iterrows():
-            hit_count = int(rounds[(rounds['hole'] == index) & (rounds['outcome'] == "HIT")]['count'])
-            accuracy = hit_count / int(row['count'])
-            new_rounds.loc[index, 'HIT_Count'] = hit_count
-            new_rounds.loc[index, 'Accuracy'] = accuracy
-        new_rounds.index.names = ['_id']
-        return new_rounds                                                                               # Change the index for consistency.
+        df = DataFrame(self._read_aggregate(self._fairway_accuracy_query(course_id, start, end)), columns=['_id', 'count', 'HIT_Count', 'Accuracy'])
+        return df.set_index('_id')
 
-    def _greens_by_hole(self, course_id):
+    def _fairway_accuracy_query(self, course_id, start=None, end=None):
+
+        """
+        Function Description: Build the query that counts the fairways hit and attempted on each hole.
+        Function Parameters: course_id (Int: The course id.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (List: The MongoDB query.)
+        """
+
+        return [
+            {"$match": round_filter(course_id, start, end)},
+            {"$unwind": "$scorecardDetails"},
+            {"$unwind": "$scorecardDetails.scorecard.holes"},
+            {"$addFields": {"fairway_outcome": fairway_outcome}},
+            {"$match": {"fairway_outcome": {"$nin": no_fairway_outcomes}}},                                 # Filter out records that do not apply.
+            {"$group": {"_id": "$scorecardDetails.scorecard.holes.number",
+                "count": {"$sum": 1},
+                "HIT_Count": {"$sum": {"$cond": [{"$eq": ["$fairway_outcome", "HIT"]}, 1, 0]}}}},
+            {"$project": {"count": 1, "HIT_Count": 1, "Accuracy": {"$divide": ["$HIT_Count", "$count"]}}},
+            {'$sort': {"_id": 1}}
+        ]
+
+    def _greens_by_hole(self, course_id, start=None, end=None):
 
         """
         Function Description: Organise the necessary data to determine the user has hit a green.
-        Function Parameters: course_id (Int: The course id to retrieve the stats.)
+        Function Parameters: course_id (Int: The course id to retrieve the stats.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
         Function Throws: Nothing
         Function Returns: (DataFrame: The data organised in a Pandas DataFrame.)
         """
 
-        return DataFrame(list(self.collection.aggregate([
+        return load_records(self.collection, self._greens_by_hole_query(course_id, start, end), green_schema)
+
+    def _greens_by_hole_query(self, course_id, start=None, end=None):
+
+        """
+        Function Description: Build the query that lists the strokes and putts of every hole played.
+        Function Parameters: course_id (Int: The course id.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (List: The MongoDB query.)
+        """
+
+        return [
             {
-                '$match': {
-                    'courseSnapshots.courseGlobalId': course_id
-                }
+                '$match': round_filter(course_id, start, end)
             }, {
                 '$unwind': {
                     'path': '$scorecardDetails'
@@ -191,7 +456,7 @@ class Stats():
                     'putts': '$scorecardDetails.scorecard.holes.putts'
                 }
             }
-        ])))
+        ]
 
     def _is_hit(self, par_df, hole_number, strokes, putts):
 
@@ -205,20 +470,32 @@ class Stats():
         Function Returns: (Boolean: True if GIR or under and False otherwise.)
         """
 
-        hole_par = int(par_df.loc[hole_number, :]['Par'])
-        if hole_par == 5:
-            x = strokes - putts - 3
-        elif hole_par == 4:
-            x = strokes - putts - 2
-        else:
-            x = strokes - putts - 1
-        return x <= 0
+        return bool(self.is_hit(int(par_df.loc[hole_number, :]['Par']), strokes, putts))
 
-    def get_green_accuracy(self, course_id):
+    @staticmethod
+    def is_hit(pars, strokes, putts):
+
+        """
+        Function Description: Determine whether greens were hit in regulation for a batch of holes at once.
+        Function Parameters: pars (Array: The par of each hole played.),
+            strokes (Array: The number of strokes incurred within each hole.),
+            putts (Array: The number of putts taken on each hole.)
+        Function Throws: Nothing
+        Function Returns: (Array: True where the green was hit in regulation or under and False otherwise, including holes without a known par.)
+        """
+
+        pars = asarray(pars, dtype=float)
+        to_green = asarray(strokes, dtype=float) - asarray(putts, dtype=float)
+        regulation = select([pars == 5, pars == 4], [3, 2], 1)                       # Par fives allow three shots to the green, par fours two and the rest one.
+        return (to_green <= regulation) & ~isnan(pars)                              # A hole without a par is not taken for a par three.
+
+    @instrumented
+    @cached_stat
+    def get_green_accuracy(self, course_id, start=None, end=None):
 
         """
         Function Description: Calculate the greens hit on a particular course.
-        Function Parameters: course_id (Int: The course id.)
+        Function Parameters: course_id (Int: The course id.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
         Function Throws: Nothing
         Function Returns: (DataFrame: The accuracy of greens hit on the course.)
 
@@ -228,20 +505,482 @@ class Stats():
             
         """
 
-        greens = self._greens_by_hole(course_id)                                               # Get the necessary prep data.
-        caledon_pars = self.get_hole_pars(course_id)
-        green_percentage = {}
-        for _, row in greens.iterrows():
-            hole_number = row['hole_number']
-            strokes = row['strokes']
-            putts = row['putts']
-            hit = self._is_hit(caledon_pars, hole_number, strokes, putts)                      # Count the number of times the greens have been hit.
-            if hole_number not in green_percentage:
-                green_percentage[hole_number] = {'hit_count': 0, 'attempt': 0}
-            if hit:
-                green_percentage[hole_number]['hit_count'] += 1
-            green_percentage[hole_number]['attempt'] += 1
-        green_perct = DataFrame(green_percentage).T
+        if self._is_precomputed(start, end):
+            df = self._get_precomputed_summary(course_id, start, end)[['green_hit_count', 'green_attempt', 'green_accuracy']]
+            return df.rename(columns={'green_hit_count': 'hit_count', 'green_attempt': 'attempt', 'green_accuracy': 'hit_percentage'})
+
+        greens = self._greens_by_hole(course_id, start, end)                                               # Get the necessary prep data.
+        pars = self.get_hole_pars(course_id)
+        greens['hit'] = self.is_hit(greens['hole_number'].map(pars['Par']), greens['strokes'], greens['putts'])
+        green_perct = greens.groupby(greens['hole_number'].astype(int)).agg(hit_count=('hit', 'sum'), attempt=('hit', 'size'))
         green_perct.index.names = ['_id']
         green_perct['hit_percentage'] = green_perct['hit_count'] / green_perct['attempt']
-        return green_perct
\ No newline at end of file
+        return green_perct
+
+    @instrumented
+    @cached_stat
+    def get_course_summary(self, course_id, holes=18, start=None, end=None):
+
+        """
+        Function Description: Get the putting, scoring, fairway and green stats of every hole at a course in a single pass over the rounds.
+        Function Parameters: course_id (Int: The course id.), holes (Int: The number of holes completed in the round used to find the pars.),
+            start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The per hole summary of the course.)
+
+                putting_average  scoring_average  Par  fairway_hit_count  fairway_attempt  fairway_accuracy  green_hit_count  green_attempt  green_accuracy
+            _id
+            1          1.925926         4.888889    4                 61              134          0.455224               43            135        0.318519
+
+        """
+
+        if self._is_precomputed(start, end):
+            return self._get_precomputed_summary(course_id, start, end)
+
+        summary = self._read_aggregate(self._course_summary_query(course_id, holes, start, end))[0]
+        if not summary['holes']:
+            return DataFrame(columns=summary_columns, index=Index([], name='_id'))                 # No rounds within the dates.
+        if summary['pars']:
+            pars = self._pars_to_frame(summary['pars'][0]['holePars'][0])
+        else:
+            pars = self.get_hole_pars(course_id, holes)                                     # No complete round within the dates, so look beyond them.
+        df = DataFrame(summary['holes']).set_index('_id').sort_index().join(pars)
+        df['fairway_accuracy'] = df['fairway_hit_count'] / df['fairway_attempt']
+        greens = DataFrame(summary['greens'])
+        hit = self.is_hit(greens['hole'].map(pars['Par']), greens['to_green'], 0)
+        greens['hit'] = greens['count'].where(hit, 0)
+        greens = greens.groupby('hole')[['hit', 'count']].sum()
+        df['green_hit_count'] = greens['hit']
+        df['green_attempt'] = greens['count']
+        df['green_accuracy'] = df['green_hit_count'] / df['green_attempt']
+        return df[summary_columns]
+
+    def _course_summary_query(self, course_id, holes, start=None, end=None):
+
+        """
+        Function Description: Build the query that summarises every hole of a course in one pass.
+        Function Parameters: course_id (Int: The course id.), holes (Int: The number of holes completed in the round.),
+            start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (List: The MongoDB query.)
+        """
+
+        return [
+            {"$match": round_filter(course_id, start, end)},
+            {"$unwind": "$scorecardDetails"},
+            {"$unwind": "$scorecardDetails.scorecard.holes"},
+            {"$facet": {
+                "holes": [                                                                              # Every average and fairway count in one group.
+                    {"$group": {"_id": "$scorecardDetails.scorecard.holes.number",
+                        "putting_average": {"$avg": "$scorecardDetails.scorecard.holes.putts"},
+                        "scoring_average": {"$avg": "$scorecardDetails.scorecard.holes.strokes"},
+                        "fairway_hit_count": {"$sum": {"$cond": [
+                            {"$eq": ["$scorecardDetails.scorecard.holes.fairwayShotOutcome", "HIT"]}, 1, 0]}},
+                        "fairway_attempt": {"$sum": {"$cond": [{"$in": [fairway_outcome, no_fairway_outcomes]}, 0, 1]}}}}
+                ],
+                "greens": [                                                                             # Strokes taken to reach the green, counted per hole.
+                    {"$group": {"_id": {"hole": "$scorecardDetails.scorecard.holes.number",
+                        "to_green": {"$subtract": ["$scorecardDetails.scorecard.holes.strokes", "$scorecardDetails.scorecard.holes.putts"]}},
+                        "count": {"$sum": 1}}},
+                    {"$project": {"_id": 0, "hole": "$_id.hole", "to_green": "$_id.to_green", "count": 1}}
+                ],
+                "pars": [
+                    {"$match": {"scorecardDetails.scorecard.holesCompleted": holes}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 0, "holePars": "$courseSnapshots.holePars"}}
+                ]
+            }}
+        ]
+
+    @instrumented
+    def get_course_ids(self):
+
+        """
+        Function Description: Get the id of every course played.
+        Function Parameters: Nothing
+        Function Throws: Nothing
+        Function Returns: (List: The course ids in ascending order.)
+        """
+
+        if self.source == 'cache':
+            return sorted(int(course_id) for course_id in self.holes['course_id'].unique())
+        if self.source == 'rollups':
+            return sorted(self.rollups.distinct('course_id'))
+        return sorted(self.collection.distinct('courseSnapshots.courseGlobalId'))
+
+    @instrumented
+    @cached_stat
+    def get_course_summaries(self, course_ids=None, holes=18, start=None, end=None):
+
+        """
+        Function Description: Get the course summary of many courses at once, grouped by course and hole in a single pass over the rounds.
+        Function Parameters: course_ids (List: The course ids. Every course when None.),
+            holes (Int: The number of holes completed in the round used to find the pars.),
+            start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The same columns as get_course_summary indexed by course id and hole.)
+
+                            putting_average  scoring_average  Par  fairway_hit_count  ...  green_accuracy
+            course_id hole
+            17772     1            1.925926         4.888889    4                 61  ...        0.318519
+
+        """
+
+        course_ids = None if course_ids is None else list(course_ids)
+        if self.source == 'cache':
+            played = self._get_cache_holes(course_ids, start, end)
+            return self._summarise_holes(played, [played['course_id'].rename('course_id'), played['hole'].astype(int).rename('hole')])
+        if self._is_precomputed(start, end):
+            query = {} if course_ids is None else {'course_id': {'$in': course_ids}}
+            rollups = json_normalize(self._read_rollups(query, {'_id': 0}))
+            if rollups.empty:
+                return DataFrame(columns=summary_columns, index=MultiIndex.from_tuples([], names=['course_id', 'hole']))
+            return self._summarise_rollups(rollups.set_index(['course_id', 'hole']).sort_index())
+
+        summary = self._read_aggregate(self._course_summaries_query(course_ids, holes, start, end))[0]
+        if not summary['holes']:
+            return DataFrame(columns=summary_columns, index=MultiIndex.from_tuples([], names=['course_id', 'hole']))
+        df = DataFrame(summary['holes']).set_index(['course_id', 'hole']).sort_index()
+        hole_pars = {pars['_id']: pars['full'] or pars['any'] for pars in summary['pars']}
+        pars = DataFrame([(course_id, hole + 1, int(par)) for course_id, course_pars in hole_pars.items() for hole, par in enumerate(course_pars)],
+            columns=['course_id', 'hole', 'Par']).astype({'Par': 'UInt8'}).set_index(['course_id', 'hole'])
+        df = df.join(pars['Par'])
+        df['fairway_accuracy'] = df['fairway_hit_count'] / df['fairway_attempt']
+        greens = DataFrame(summary['greens']).join(pars, on=['course_id', 'hole'])
+        greens['hit'] = greens['count'].where(self.is_hit(greens['Par'], greens['to_green'], 0), 0)
+        greens = greens.groupby(['course_id', 'hole'])[['hit', 'count']].sum()
+        df['green_hit_count'] = greens['hit']
+        df['green_attempt'] = greens['count']
+        df['green_accuracy'] = df['green_hit_count'] / df['green_attempt']
+        return df[summary_columns]
+
+    def _course_summaries_query(self, course_ids, holes, start=None, end=None):
+
+        """
+        Function Description: Build the query that summarises every hole of many courses in one pass.
+        Function Parameters: course_ids (List: The course ids. Every course when None.), holes (Int: The number of holes completed in the round.),
+            start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (List: The MongoDB query.)
+        """
+
+        hole = {"course_id": "$course_id", "hole": "$scorecardDetails.scorecard.holes.number"}
+        return [
+            {"$match": round_filter(course_ids, start, end)},
+            {"$unwind": "$scorecardDetails"},
+            {"$addFields": {"course_id": {"$arrayElemAt": ["$courseSnapshots.courseGlobalId", 0]},
+                "holePars": {"$arrayElemAt": ["$courseSnapshots.holePars", 0]}}},
+            {"$facet": {
+                "holes": [                                                                              # Every average and fairway count in one group.
+                    {"$unwind": "$scorecardDetails.scorecard.holes"},
+                    {"$group": {"_id": hole,
+                        "putting_average": {"$avg": "$scorecardDetails.scorecard.holes.putts"},
+                        "scoring_average": {"$avg": "$scorecardDetails.scorecard.holes.strokes"},
+                        "fairway_hit_count": {"$sum": {"$cond": [
+                            {"$eq": ["$scorecardDetails.scorecard.holes.fairwayShotOutcome", "HIT"]}, 1, 0]}},
+                        "fairway_attempt": {"$sum": {"$cond": [{"$in": [fairway_outcome, no_fairway_outcomes]}, 0, 1]}}}},
+                    {"$project": {"_id": 0, "course_id": "$_id.course_id", "hole": "$_id.hole", "putting_average": 1, "scoring_average": 1,
+                        "fairway_hit_count": 1, "fairway_attempt": 1}}
+                ],
+                "greens": [                                                                             # Strokes taken to reach the green, counted per hole.
+                    {"$unwind": "$scorecardDetails.scorecard.holes"},
+                    {"$group": {"_id": {"course_id": "$course_id", "hole": "$scorecardDetails.scorecard.holes.number",
+                        "to_green": {"$subtract": ["$scorecardDetails.scorecard.holes.strokes", "$scorecardDetails.scorecard.holes.putts"]}},
+                        "count": {"$sum": 1}}},
+                    {"$project": {"_id": 0, "course_id": "$_id.course_id", "hole": "$_id.hole", "to_green": "$_id.to_green", "count": 1}}
+                ],
+                "pars": [                                                                               # One par string per course, from a round of the given length when there is one.
+                    {"$group": {"_id": "$course_id", "any": {"$first": "$holePars"},
+                        "full": {"$max": {"$cond": [{"$eq": ["$scorecardDetails.scorecard.holesCompleted", holes]}, "$holePars", None]}}}}
+                ]
+            }}
+        ]
+
+    @instrumented
+    def get_by_course(self, getter, course_ids=None, max_workers=8, **kwargs):
+
+        """
+        Function Description: Run a single course getter for many courses over a thread pool. Used for the stats that are not grouped by course
+            on the server. The shared client and its pool are safe to use across threads.
+        Function Parameters: getter (String: The name of the getter such as 'get_fairways'.), course_ids (List: The course ids. Every course when None.),
+            max_workers (Int: The most queries run at once.), kwargs (Keyword Arguments: Passed on to the getter.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The results of the getter stacked under a course_id index level.)
+        """
+
+        course_ids = self.get_course_ids() if course_ids is None else list(course_ids)
+        method = getattr(self, getter)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(lambda course_id: method(course_id, **kwargs), course_ids))
+        return concat(results, keys=course_ids, names=['course_id'])
+
+    @instrumented
+    @cached_stat
+    def get_rolling_trend(self, course_id=None, window=5, holes=18, start=None, end=None):
+
+        """
+        Function Description: Get the score, putts, fairways hit (FIR) and greens hit (GIR) of every round in the order they were played,
+            along with their moving averages over the last few rounds. The rollups hold no rounds, so they are aggregated from MongoDB.
+        Function Parameters: course_id (Int: The course id. The rounds of every course form one trend when None.),
+            window (Int: The number of rounds in each moving average.), holes (Int: Only include rounds of this length. Every round when None.),
+            start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: One row per round.)
+
+                scorecard_id  course_id          start_time  score  putts       fir       gir  score_avg  putts_avg   fir_avg   gir_avg
+            0      155069236      17772 2019-05-04 09:12:00     93     36  0.428571  0.222222       93.0       36.0  0.428571  0.222222
+
+        """
+
+        if self.source == 'cache':
+            return self._get_cache_trend(course_id, window, holes, start, end)
+
+        df = DataFrame(self._read_aggregate(self._rolling_trend_query(course_id, window, holes, start, end)),
+            columns=trend_columns + [stat + '_avg' for stat in trend_stats])
+        df['start_time'] = to_datetime(df['start_time'])
+        return df
+
+    def _rolling_trend_query(self, course_id, window, holes, start=None, end=None):
+
+        """
+        Function Description: Build the query that summarises every round and averages it with the rounds before it with $setWindowFields (MongoDB 5.0).
+        Function Parameters: course_id (Int: The course id. Every course when None.), window (Int: The number of rounds in each moving average.),
+            holes (Int: Only include rounds of this length. Every round when None.),
+            start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (List: The MongoDB query.)
+        """
+
+        condition = round_filter(course_id, start, end)
+        if holes is not None:
+            condition["scorecardDetails.scorecard.holesCompleted"] = holes
+        outcome = {"$ifNull": ["$$hole.fairwayShotOutcome", "NO_ENTRY"]}
+        par = {"$toInt": {"$substrCP": ["$$pars", {"$subtract": ["$$hole.number", 1]}, 1]}}                     # The hole pars are stored as a string of digits.
+        return [
+            {"$match": condition},
+            {"$unwind": "$scorecardDetails"},
+            {"$project": {
+                "_id": 0,
+                "scorecard_id": "$scorecardDetails.scorecard.id",
+                "course_id": {"$arrayElemAt": ["$courseSnapshots.courseGlobalId", 0]},
+                "start_time": "$scorecardDetails.scorecard.startTime",
+                "score": {"$sum": "$scorecardDetails.scorecard.holes.strokes"},
+                "putts": {"$sum": "$scorecardDetails.scorecard.holes.putts"},
+                "fairway_hits": {"$size": {"$filter": {"input": "$scorecardDetails.scorecard.holes", "as": "hole",
+                    "cond": {"$eq": [outcome, "HIT"]}}}},
+                "no_fairways": {"$size": {"$filter": {"input": "$scorecardDetails.scorecard.holes", "as": "hole",
+                    "cond": {"$in": [outcome, no_fairway_outcomes]}}}},
+                "green_hits": {"$let": {"vars": {"pars": {"$arrayElemAt": ["$courseSnapshots.holePars", 0]}}, "in": {"$size": {"$filter": {
+                    "input": "$scorecardDetails.scorecard.holes", "as": "hole",
+                    "cond": {"$and": [{"$isNumber": "$$hole.strokes"}, {"$isNumber": "$$hole.putts"},          # A hole saved without a score is a miss.
+                        {"$lte": [{"$subtract": ["$$hole.strokes", "$$hole.putts"]},
+                        {"$switch": {"branches": [{"case": {"$eq": [par, 5]}, "then": 3}, {"case": {"$eq": [par, 4]}, "then": 2}], "default": 1}}]}]}}}}}},
+                "holes_played": {"$size": "$scorecardDetails.scorecard.holes"}
+            }},
+            {"$project": {
+                "scorecard_id": 1, "course_id": 1, "start_time": 1, "score": 1, "putts": 1,
+                "fir": {"$let": {"vars": {"attempts": {"$subtract": ["$holes_played", "$no_fairways"]}},
+                    "in": {"$cond": [{"$gt": ["$$attempts", 0]}, {"$divide": ["$fairway_hits", "$$attempts"]}, None]}}},
+                "gir": {"$cond": [{"$gt": ["$holes_played", 0]}, {"$divide": ["$green_hits", "$holes_played"]}, None]}
+            }},
+            {"$setWindowFields": {
+                "sortBy": {"start_time": 1},
+                "output": {stat + '_avg': {"$avg": "$" + stat, "window": {"documents": [1 - window, 0]}} for stat in trend_stats}
+            }},
+            {"$sort": {"start_time": 1}}
+        ]
+
+    def _get_cache_trend(self, course_id, window, holes, start=None, end=None):
+
+        """
+        Function Description: Build the rolling trend from the local hole cache in one vectorized pass.
+        Function Parameters: course_id (Int: The course id. Every course when None.), window (Int: The number of rounds in each moving average.),
+            holes (Int: Only include rounds of this length. Every round when None.),
+            start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The same per round trend returned by get_rolling_trend.)
+        """
+
+        played = self._get_cache_holes(course_id, start, end, holes)
+        played = played.assign(strokes=played['strokes'].astype(float), putts=played['putts'].astype(float),
+            fairway_hit=played['fairway'] == 'HIT', fairway_attempt=~played['fairway'].isin(no_fairway_outcomes),
+            green_hit=self.is_hit(played['par'].astype(float), played['strokes'].astype(float), played['putts'].astype(float)))
+        rounds = played.groupby('scorecard_id').agg(course_id=('course_id', 'first'), start_time=('start_time', 'first'),
+            score=('strokes', 'sum'), putts=('putts', 'sum'), fairway_hits=('fairway_hit', 'sum'), fairway_attempts=('fairway_attempt', 'sum'),
+            green_hits=('green_hit', 'sum'), holes_played=('green_hit', 'size'))
+        rounds = rounds.reset_index().sort_values('start_time', kind='stable').reset_index(drop=True)
+        rounds['fir'] = rounds['fairway_hits'] / rounds['fairway_attempts'].where(rounds['fairway_attempts'] > 0)
+        rounds['gir'] = rounds['green_hits'] / rounds['holes_played']
+        averages = rounds[trend_stats].rolling(window, min_periods=1).mean().add_suffix('_avg')
+        return rounds[trend_columns].join(averages)
+
+    def _get_rollups(self, course_id):
+
+        """
+        Function Description: Read the rollup of every hole at a course. Each rollup holds the counts and sums of every round played.
+        Function Parameters: course_id (Int: The course id.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The rollups indexed by the hole number with the fairway outcomes flattened into 'fairway.<OUTCOME>' columns.)
+        """
+
+        rollups = json_normalize(self._read_rollups({'course_id': course_id}, {'_id': 0, 'course_id': 0}))
+        return rollups.set_index('hole').rename_axis('_id').sort_index()
+
+    def _get_rollup_summary(self, course_id):
+
+        """
+        Function Description: Build the per hole course summary from the rollups instead of the rounds.
+        Function Parameters: course_id (Int: The course id.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The same per hole summary returned by get_course_summary.)
+        """
+
+        return self._summarise_rollups(self._get_rollups(course_id))
+
+    def _summarise_rollups(self, rollups):
+
+        """
+        Function Description: Turn the counts and sums of the rollups into the course summary columns.
+        Function Parameters: rollups (DataFrame: The rollups with the fairway outcomes flattened into 'fairway.<OUTCOME>' columns.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The summary with the index of the rollups.)
+        """
+
+        outcomes = rollups.filter(like='fairway.').fillna(0)
+        attempts = outcomes.drop(columns=['fairway.' + outcome for outcome in no_fairway_outcomes], errors='ignore')
+        df = DataFrame(index=rollups.index)
+        df['putting_average'] = rollups['putts_sum'] / rollups['putts_count']
+        df['scoring_average'] = rollups['strokes_sum'] / rollups['strokes_count']
+        df['Par'] = rollups['par'].astype('UInt8')
+        df['fairway_hit_count'] = outcomes.get('fairway.HIT', 0)
+        df['fairway_attempt'] = attempts.sum(axis=1)
+        df['fairway_accuracy'] = df['fairway_hit_count'] / df['fairway_attempt']
+        df['green_hit_count'] = rollups['green_hit']
+        df['green_attempt'] = rollups['rounds']
+        df['green_accuracy'] = df['green_hit_count'] / df['green_attempt']
+        return df.astype(dict.fromkeys(['fairway_hit_count', 'fairway_attempt', 'green_hit_count', 'green_attempt'], int))   # Counts as the Mongo source returns them.
+
+    def _get_rollup_fairways(self, course_id):
+
+        """
+        Function Description: Get the count of Fairways hit and missed from the rollups.
+        Function Parameters: course_id (Int: The course id.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The same outcome, hole and count data returned by get_fairways.)
+        """
+
+        outcomes = self._get_rollups(course_id).filter(like='fairway.')
+        outcomes.columns = outcomes.columns.str.replace('fairway.', '', regex=False)
+        df = outcomes.rename_axis('hole').reset_index().melt(id_vars='hole', var_name='outcome', value_name='count').dropna()
+        df = df[~df['outcome'].isin(no_fairway_outcomes) & (df['count'] > 0)]
+        return df[['outcome', 'hole', 'count']].astype({'count': int}).reset_index(drop=True)
+
+    def _get_cache_holes(self, course_id=None, start=None, end=None, holes_completed=None):
+
+        """
+        Function Description: Select the holes of a course played within a date range from the local hole cache.
+        Function Parameters: course_id (Int or List: The course id or ids. Every course when None.), start (Date: The earliest round to include.),
+            end (Date: The round start time to stop before.), holes_completed (Int: Only include rounds of this length. Every round when None.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The selected hole records.)
+        """
+
+        holes = self.holes
+        if isinstance(course_id, (list, tuple, set)):
+            holes = holes[holes['course_id'].isin(list(course_id))]
+        elif course_id is not None:
+            holes = holes[holes['course_id'] == course_id]
+        if start is not None:
+            holes = holes[holes['start_time'] >= to_datetime(start)]
+        if end is not None:
+            holes = holes[holes['start_time'] < to_datetime(end)]
+        if holes_completed is not None:
+            holes = holes[holes['holes_completed'] == holes_completed]
+        return holes
+
+    def _get_cache_summary(self, course_id, start=None, end=None):
+
+        """
+        Function Description: Build the per hole course summary from the local hole cache.
+        Function Parameters: course_id (Int: The course id.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The same per hole summary returned by get_course_summary.)
+        """
+
+        holes = self._get_cache_holes(course_id, start, end)
+        return self._summarise_holes(holes, [holes['hole'].astype(int).rename('_id')])
+
+    def _summarise_holes(self, holes, keys):
+
+        """
+        Function Description: Summarise hole records from the local hole cache into the course summary columns.
+        Function Parameters: holes (DataFrame: The hole records.), keys (List: The Series to group the holes by.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The summary indexed by the keys.)
+        """
+
+        hits = Series(self.is_hit(holes['par'], holes['strokes'], holes['putts']), index=holes.index)
+        df = DataFrame({
+            'putting_average': holes['putts'].astype(float).groupby(keys).mean(),
+            'scoring_average': holes['strokes'].astype(float).groupby(keys).mean(),
+            'Par': holes['par'].groupby(keys).max().astype('UInt8'),
+            'fairway_hit_count': (holes['fairway'] == 'HIT').groupby(keys).sum(),
+            'fairway_attempt': (~holes['fairway'].isin(no_fairway_outcomes)).groupby(keys).sum(),
+            'green_hit_count': hits.groupby(keys).sum(),
+            'green_attempt': hits.groupby(keys).size()
+        })
+        df['fairway_accuracy'] = df['fairway_hit_count'] / df['fairway_attempt']
+        df['green_accuracy'] = df['green_hit_count'] / df['green_attempt']
+        return df[summary_columns]
+
+    def _get_cache_fairways(self, course_id, start=None, end=None):
+
+        """
+        Function Description: Get the count of Fairways hit and missed from the local hole cache.
+        Function Parameters: course_id (Int: The course id.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The same outcome, hole and count data returned by get_fairways.)
+        """
+
+        holes = self._get_cache_holes(course_id, start, end)
+        holes = holes[~holes['fairway'].isin(no_fairway_outcomes)]
+        df = holes.groupby(['fairway', 'hole'], observed=True).size().rename('count').reset_index()
+        return df.rename(columns={'fairway': 'outcome'}).astype({'outcome': str, 'hole': int})
+
+    def _is_precomputed(self, start=None, end=None):
+
+        """
+        Function Description: Check whether a getter can be answered without aggregating the rounds. The rollups hold all time totals,
+            so a date range is aggregated from the rounds instead.
+        Function Parameters: start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (Boolean: True if the rollups or the local hole cache can be used and False otherwise.)
+        """
+
+        return self.source == 'cache' or (self.source == 'rollups' and start is None and end is None)
+
+    def _get_precomputed_summary(self, course_id, start=None, end=None):
+
+        """
+        Function Description: Build the per hole course summary from the rollups or the local hole cache.
+        Function Parameters: course_id (Int: The course id.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The same per hole summary returned by get_course_summary.)
+        """
+
+        if self.source == 'cache':
+            return self._get_cache_summary(course_id, start, end)
+        return self._get_rollup_summary(course_id)
+
+    def _get_precomputed_fairways(self, course_id, start=None, end=None):
+
+        """
+        Function Description: Get the count of Fairways hit and missed from the rollups or the local hole cache.
+        Function Parameters: course_id (Int: The course id.), start (Date: The earliest round to include.), end (Date: The round start time to stop before.)
+        Function Throws: Nothing
+        Function Returns: (DataFrame: The same outcome, hole and count data returned by get_fairways.)
+        """
+
+        if self.source == 'cache':
+            return self._get_cache_fairways(course_id, start, end)
+        return self._get_rollup_fairways(course_id)
@@ -0,0 +1,118 @@
+# Description: Keep a local columnar copy of every hole played so the stats can be computed offline.
+# Author: Michael Krakovsky
+
+from sys import path
+path.extend('../../../../')                      # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis.hole_records import empty_frame, load_records
+from My_Golf_Journey.src.bin.stat_apis.instrumentation import phase
+from pathlib import Path
+from os import replace
+from pandas import CategoricalDtype, Timestamp, concat, read_parquet
+
+cache_location = Path(__file__).absolute().parent.parent.parent / 'data' / 'hole_cache.parquet'
+
+class HoleCache():
+
+    def __init__(self, location=cache_location):
+
+        """
+        Class Description: Store one row per (scorecard, hole) in a Parquet file with narrow dtypes.
+        Class Instantiators: location (Path: Where the Parquet file is kept.)
+        """
+
+        self.location = Path(location)
+
+    def _hole_query(self, since=None):
+
+        """
+        Function Description: Build the query that unwinds every scorecard into its hole records.
+        Function Parameters: since (String: Only include scorecards that started on or after this date (YYYY-MM-DD).)
+        Function Throws: Nothing
+        Function Returns: (List: The MongoDB pipeline.)
+        """
+
+        query = [{"$match": {"scorecardDetails.scorecard.startTime": {"$gte": since}}}] if since else []
+        return query + [
+            {"$unwind": "$scorecardDetails"},
+            {"$unwind": "$scorecardDetails.scorecard.holes"},
+            {"$project": {
+                "_id": 0,
+                "scorecard_id": "$scorecardDetails.scorecard.id",
+                "course_id": {"$arrayElemAt": ["$courseSnapshots.courseGlobalId", 0]},
+                "start_time": "$scorecardDetails.scorecard.startTime",
+                "holes_completed": "$scorecardDetails.scorecard.holesCompleted",
+                "hole": "$scorecardDetails.scorecard.holes.number",
+                "strokes": "$scorecardDetails.scorecard.holes.strokes",
+                "putts": "$scorecardDetails.scorecard.holes.putts",
+                "fairway": {"$ifNull": ["$scorecardDetails.scorecard.holes.fairwayShotOutcome", "NO_ENTRY"]},
+                "par": {"$let": {                                                                 # The hole pars are stored as a string of digits.
+                    "vars": {"pars": {"$arrayElemAt": ["$courseSnapshots.holePars", 0]},
+                        "index": {"$subtract": ["$scorecardDetails.scorecard.holes.number", 1]}},
+                    "in": {"$cond": [{"$isArray": "$$pars"}, {"$arrayElemAt": ["$$pars", "$$index"]},
+                        {"$toInt": {"$substrCP": ["$$pars", "$$index", 1]}}]}}}
+            }}
+        ]
+
+    def exists(self):
+
+        """
+        Function Description: Check whether the cache has been exported.
+        Function Parameters: Nothing
+        Function Throws: Nothing
+        Function Returns: (Boolean: True if the cache file exists and False otherwise.)
+        """
+
+        return self.location.exists()
+
+    def load(self):
+
+        """
+        Function Description: Load the hole records. The Parquet file is memory mapped rather than read into a buffer first.
+        Function Parameters: Nothing
+        Function Throws: FileNotFoundError (The cache has not been exported.)
+        Function Returns: (DataFrame: One row per (scorecard, hole).)
+        """
+
+        if not self.exists():
+            raise FileNotFoundError("No hole cache at {}. Refresh it from MongoDB first.".format(self.location))
+        return read_parquet(self.location, engine='pyarrow', memory_map=True)
+
+    def watermark(self, holes=None):
+
+        """
+        Function Description: Get the start time of the latest scorecard in the cache.
+        Function Parameters: holes (DataFrame: The loaded cache, read from disk when not given.)
+        Function Throws: Nothing
+        Function Returns: (Timestamp: The latest start time or None when the cache is empty.)
+        """
+
+        if holes is None:
+            holes = self.load() if self.exists() else empty_frame()
+        return None if holes.empty else Timestamp(holes['start_time'].max())
+
+    def refresh(self, collection):
+
+        """
+        Function Description: Append the scorecards played since the watermark. Scorecards from the watermark's day are
+            fetched again and de-duplicated, so nothing is missed between refreshes.
+        Function Parameters: collection (Collection: The connection to the Scorecards collection.)
+        Function Throws: Nothing
+        Function Returns: (Int: The number of hole records added to the cache.)
+        """
+
+        holes = self.load() if self.exists() else empty_frame()
+        latest = self.watermark(holes)
+        since = latest.strftime('%Y-%m-%d') if latest is not None else None
+        new_holes = load_records(collection, self._hole_query(since))                               # Streamed into the narrow dtypes batch by batch.
+        new_holes = new_holes[~new_holes['scorecard_id'].isin(holes['scorecard_id'])]
+        if new_holes.empty and self.exists():
+            return 0
+        fairways = {'fairway': CategoricalDtype(holes['fairway'].cat.categories.union(new_holes['fairway'].cat.categories))}
+        holes = concat([holes.astype(fairways), new_holes.astype(fairways)], ignore_index=True)
+        self.location.parent.mkdir(parents=True, exist_ok=True)
+        temp_location = self.location.with_suffix('.tmp')                                          # Swap the file in so a failed write keeps the old cache.
+        with phase('write_cache') as write:
+            holes.to_parquet(temp_location, engine='pyarrow', index=False)
+            replace(temp_location, self.location)
+            write.count(rows=len(holes))
+        return len(new_holes)
@@ -0,0 +1,94 @@
+# Description: Define the compact schema of the hole records and build their columns straight from a MongoDB cursor.
+# Author: Michael Krakovsky
+
+from pandas import DataFrame, Series, array, concat, to_datetime
+from pandas.api.types import union_categoricals
+from My_Golf_Journey.src.bin.stat_apis.instrumentation import phase
+
+hole_schema = {
+    'scorecard_id': 'int64',
+    'course_id': 'int64',
+    'start_time': 'datetime64[ns]',
+    'holes_completed': 'UInt8',
+    'hole': 'uint8',
+    'strokes': 'UInt8',                                     # Nullable, a hole can be saved without a score.
+    'putts': 'UInt8',
+    'par': 'UInt8',
+    'fairway': 'category'                                   # A handful of outcomes repeated on every hole.
+}
+green_schema = {'hole_number': 'uint8', 'strokes': 'UInt8', 'putts': 'UInt8'}
+cursor_batch_size = 10000                                   # The records fetched per round trip and converted at once.
+
+def empty_frame(schema=hole_schema):
+
+    """
+    Function Description: Build an empty frame with the columns and dtypes of a schema.
+    Function Parameters: schema (Dict: The dtype of each column.)
+    Function Throws: Nothing
+    Function Returns: (DataFrame: The empty frame.)
+    """
+
+    return DataFrame({name: Series([], dtype=dtype) for name, dtype in schema.items()})
+
+def _batch_column(values, dtype):
+
+    """
+    Function Description: Convert the values of one column in a batch of records into an array of the schema dtype.
+    Function Parameters: values (List: The values, None where the record has none.), dtype (String: The dtype of the column.)
+    Function Throws: Nothing
+    Function Returns: (ExtensionArray or Categorical: The column of the batch.)
+    """
+
+    if dtype == 'category':
+        return Series(values, dtype='category').array
+    if dtype.startswith('datetime64'):
+        return to_datetime(Series(values, dtype=object)).astype(dtype).array
+    return array(values, dtype=dtype)
+
+def frame_from_cursor(cursor, schema=hole_schema, batch_size=cursor_batch_size):
+
+    """
+    Function Description: Build a frame from a cursor one batch at a time, so only a batch of records is ever held as dictionaries.
+    Function Parameters: cursor (Iterable: The records, such as a MongoDB cursor.), schema (Dict: The dtype of each column.),
+        batch_size (Int: The records converted at once.)
+    Function Throws: Nothing
+    Function Returns: (DataFrame: The records with the schema dtypes.)
+    """
+
+    chunks = {name: [] for name in schema}
+    batch = []
+    for record in cursor:
+        batch.append(record)
+        if len(batch) == batch_size:
+            for name, dtype in schema.items():
+                chunks[name].append(_batch_column([record.get(name) for record in batch], dtype))
+            batch = []
+    if batch:
+        for name, dtype in schema.items():
+            chunks[name].append(_batch_column([record.get(name) for record in batch], dtype))
+    if not chunks[next(iter(schema))]:
+        return empty_frame(schema)
+    columns = {}
+    for name, dtype in schema.items():
+        if dtype == 'category':
+            columns[name] = union_categoricals(chunks[name])                  # Batches may have seen different outcomes.
+        else:
+            columns[name] = concat([Series(chunk, copy=False) for chunk in chunks[name]], ignore_index=True)
+    return DataFrame(columns)
+
+def load_records(collection, query, schema=hole_schema, batch_size=cursor_batch_size):
+
+    """
+    Function Description: Run an aggregation and stream its results into a frame with the schema dtypes.
+    Function Parameters: collection (Collection: The collection to query.), query (List: The MongoDB query.),
+        schema (Dict: The dtype of each column.), batch_size (Int: The records fetched per round trip and converted at once.)
+    Function Throws: Nothing
+    Function Returns: (DataFrame: The records with the schema dtypes.)
+    """
+
+    with phase('aggregate'):
+        cursor = collection.aggregate(query, batchSize=batch_size)
+    with phase('stream') as stream:
+        df = frame_from_cursor(cursor, schema, batch_size)
+        stream.count(docs=len(df), rows=len(df))
+    return df
@@ -0,0 +1,146 @@
+# Description: Maintain per course, per hole rollups of the scorecards so the stats can be read without scanning every round.
+# Author: Michael Krakovsky
+
+from sys import path
+path.extend('../../../../')                      # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis.get_golf_stats import Stats
+from My_Golf_Journey.src.bin.stat_apis.query_cache import bump_version
+from My_Golf_Journey.src.bin.stat_apis.mongo_connection import close, get_scorecards_collection
+from pymongo import UpdateOne
+from collections import Counter, defaultdict
+from numbers import Number
+
+def rollups_collection(scorecard_conn):
+
+    """
+    Function Description: Get the rollup collection stored alongside the scorecards.
+    Function Parameters: scorecard_conn (Collection: The connection to the Scorecards collection.)
+    Function Throws: Nothing
+    Function Returns: (Collection: The connection to the HoleRollups collection.)
+    """
+
+    return scorecard_conn.database.HoleRollups
+
+def _course_snapshot(scorecard_doc, scorecard):
+
+    """
+    Function Description: Find the course snapshot that a scorecard was played on.
+    Function Parameters: scorecard_doc (Dict: The scorecard document from Garmin.), scorecard (Dict: One scorecard within the document.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The course snapshot or None if the document has no snapshots.)
+    """
+
+    snapshots = scorecard_doc.get('courseSnapshots', [])
+    for snapshot in snapshots:
+        if snapshot.get('courseGlobalId') == scorecard.get('courseGlobalId'):
+            return snapshot
+    return snapshots[0] if snapshots else None
+
+def hole_increments(scorecard_doc):
+
+    """
+    Function Description: Count the contribution of a scorecard document to the rollup of every hole it played.
+    Function Parameters: scorecard_doc (Dict: The scorecard document from Garmin.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The counters keyed by (course id, hole number) along with the par of each hole.)
+
+        {(17772, 1): {'par': 4, 'counts': Counter({'rounds': 1, 'strokes_sum': 5, 'fairway.HIT': 1, ...})}}
+    """
+
+    increments = {}
+    for detail in scorecard_doc.get('scorecardDetails', []):
+        scorecard = detail.get('scorecard', {})
+        snapshot = _course_snapshot(scorecard_doc, scorecard)
+        if snapshot is None:
+            continue
+        hole_pars = snapshot.get('holePars', [])
+        holes = [hole for hole in scorecard.get('holes', []) if 'number' in hole]
+        pars = [int(hole_pars[hole['number'] - 1]) if hole['number'] <= len(hole_pars) else None for hole in holes]
+        hits = Stats.is_hit([par if par is not None else float('nan') for par in pars],
+            [hole.get('strokes', float('nan')) for hole in holes],
+            [hole.get('putts', float('nan')) for hole in holes])
+        for hole, par, hit in zip(holes, pars, hits):
+            entry = increments.setdefault((snapshot['courseGlobalId'], hole['number']), {'par': par, 'counts': Counter()})
+            counts = entry['counts']
+            counts['rounds'] += 1
+            for stat in ('strokes', 'putts'):                                                    # Averages skip holes without the stat recorded.
+                if isinstance(hole.get(stat), Number):
+                    counts[stat + '_sum'] += hole[stat]
+                    counts[stat + '_count'] += 1
+            counts['fairway.' + (hole.get('fairwayShotOutcome') or 'NO_ENTRY')] += 1
+            counts['green_hit'] += int(hit and par is not None)
+    return increments
+
+def _rollup_updates(increments, sign=1):
+
+    """
+    Function Description: Convert the hole increments into the bulk updates applied to the rollup collection.
+    Function Parameters: increments (Dict: The output of hole_increments.), sign (Int: 1 to add the increments and -1 to remove them.)
+    Function Throws: Nothing
+    Function Returns: (List: The UpdateOne operations.)
+    """
+
+    updates = []
+    for (course_id, hole), entry in increments.items():
+        update = {'$inc': {stat: sign * count for stat, count in entry['counts'].items()},
+            '$setOnInsert': {'course_id': course_id, 'hole': hole}}
+        if entry['par'] is not None:
+            update['$set'] = {'par': entry['par']}
+        updates.append(UpdateOne({'_id': {'course_id': course_id, 'hole': hole}}, update, upsert=True))
+    return updates
+
+def merge_increments(scorecard_docs):
+
+    """
+    Function Description: Add up the hole increments of many scorecard documents.
+    Function Parameters: scorecard_docs (Iterable: The scorecard documents from Garmin.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The combined counters keyed by (course id, hole number) along with the par of each hole.)
+    """
+
+    totals = defaultdict(lambda: {'par': None, 'counts': Counter()})
+    for scorecard_doc in scorecard_docs:
+        for key, entry in hole_increments(scorecard_doc).items():
+            totals[key]['counts'].update(entry['counts'])
+            if entry['par'] is not None:
+                totals[key]['par'] = entry['par']
+    return totals
+
+def update_rollups(scorecard_docs, scorecard_conn, sign=1):
+
+    """
+    Function Description: Incrementally add (or remove) scorecards to the rollups of the holes they played.
+    Function Parameters: scorecard_docs (List: The scorecard documents from Garmin.),
+        scorecard_conn (Collection: The connection to the Scorecards collection.),
+        sign (Int: 1 to add the scorecards and -1 to remove them.)
+    Function Throws: Nothing
+    Function Returns: (Int: The number of hole rollups touched.)
+    """
+
+    updates = _rollup_updates(merge_increments(scorecard_docs), sign)
+    if updates:
+        rollups_collection(scorecard_conn).bulk_write(updates, ordered=False)
+    return len(updates)
+
+def rebuild_rollups(scorecard_conn):
+
+    """
+    Function Description: Rebuild every rollup from scratch by reading all the scorecards once. Used to backfill the rollups.
+    Function Parameters: scorecard_conn (Collection: The connection to the Scorecards collection.)
+    Function Throws: Nothing
+    Function Returns: (Int: The number of hole rollups written.)
+    """
+
+    totals = merge_increments(scorecard_conn.find({}, {'scorecardDetails.scorecard': 1, 'courseSnapshots.courseGlobalId': 1, 'courseSnapshots.holePars': 1}))
+    rollups = rollups_collection(scorecard_conn)
+    rollups.delete_many({})                                                                       # Clear the rollups but keep their indexes.
+    updates = _rollup_updates(totals)
+    if updates:
+        rollups.bulk_write(updates, ordered=False)
+    bump_version(scorecard_conn)                                                                  # Stats cached from the old rollups are stale.
+    return len(updates)
+
+if __name__ == "__main__":
+    count = rebuild_rollups(get_scorecards_collection())
+    print("We have rebuilt {} hole rollups.".format(count))
+    close()
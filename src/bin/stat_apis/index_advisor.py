@@ -0,0 +1,95 @@
+# Description: Declare the indexes the golf stats rely on, create them and report the query plan of every stats query.
+# Author: Michael Krakovsky
+
+from sys import path, argv
+path.extend('../../../../')                      # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis.get_golf_stats import Stats
+from pymongo import IndexModel, ASCENDING
+
+scorecard_indexes = [
+    IndexModel([('courseSnapshots.courseGlobalId', ASCENDING)], name='course_id'),                 # The $match that starts every stats query.
+    IndexModel([('scorecardDetails.scorecard.id', ASCENDING)], name='scorecard_id', unique=True),  # Ingestion looks up and upserts by scorecard id.
+    IndexModel([('scorecardDetails.scorecard.startTime', ASCENDING)], name='start_time')           # Rounds sorted or filtered by when they were played.
+]                                                                                                    # courseSnapshots and scorecardDetails are parallel arrays, so they cannot share a compound index.
+rollup_indexes = [
+    IndexModel([('course_id', ASCENDING)], name='course_id')
+]
+
+def ensure_indexes(scorecard_conn):
+
+    """
+    Function Description: Create the declared indexes. Indexes that already exist are left as they are.
+    Function Parameters: scorecard_conn (Collection: The connection to the Scorecards collection.)
+    Function Throws: Nothing
+    Function Returns: (List: The names of the indexes.)
+    """
+
+    names = scorecard_conn.create_indexes(scorecard_indexes)
+    return names + scorecard_conn.database.HoleRollups.create_indexes(rollup_indexes)
+
+def _find_values(document, key):
+
+    """
+    Function Description: Find every value of a key nested anywhere within an explain document.
+    Function Parameters: document (Dict or List: The document to search.), key (String: The key to find.)
+    Function Throws: Nothing
+    Function Returns: (Generator: The values of the key.)
+    """
+
+    if isinstance(document, dict):
+        for name, value in document.items():
+            if name == key:
+                yield value
+            yield from _find_values(value, key)
+    elif isinstance(document, list):
+        for value in document:
+            yield from _find_values(value, key)
+
+def summarise_plan(explain):
+
+    """
+    Function Description: Summarise the winning plan and execution stats of an explained query.
+    Function Parameters: explain (Dict: The output of the explain command in executionStats verbosity.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The scan used, the indexes used, the documents examined and the documents returned.)
+    """
+
+    stages = set(_find_values(explain, 'stage'))
+    stats = next(_find_values(explain, 'executionStats'), {})
+    return {
+        'scan': 'COLLSCAN' if 'COLLSCAN' in stages else 'IXSCAN' if 'IXSCAN' in stages else 'OTHER',
+        'indexes': sorted(set(_find_values(explain, 'indexName'))),
+        'docs_examined': stats.get('totalDocsExamined'),
+        'returned': stats.get('nReturned')
+    }
+
+def explain_query(collection, query):
+
+    """
+    Function Description: Run explain on an aggregation and summarise its plan.
+    Function Parameters: collection (Collection: The collection the query runs against.), query (List: The MongoDB query.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The summary of the plan.)
+    """
+
+    explain = collection.database.command('explain', {'aggregate': collection.name, 'pipeline': query, 'cursor': {}}, verbosity='executionStats')
+    return summarise_plan(explain)
+
+def plan_report(stats, course_id):
+
+    """
+    Function Description: Explain the query of every Stats getter for a course.
+    Function Parameters: stats (Stats: The stats object whose queries are explained.), course_id (Int: The course id.)
+    Function Throws: Nothing
+    Function Returns: (Dict: The summary of each plan by getter name.)
+    """
+
+    return {name: explain_query(stats.collection, query) for name, query in stats.get_queries(course_id).items()}
+
+if __name__ == "__main__":
+    course_id = int(argv[1]) if len(argv) > 1 else 17772
+    stats = Stats()
+    print("Indexes: {}".format(', '.join(ensure_indexes(stats.collection))))
+    for name, plan in plan_report(stats, course_id).items():
+        print("{:<25} {:<8} {:<12} examined {:>6} returned {:>6}".format(name, plan['scan'], ','.join(plan['indexes']) or '-',
+            str(plan['docs_examined']), str(plan['returned'])))
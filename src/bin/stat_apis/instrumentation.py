@@ -0,0 +1,234 @@
+# Description: Time the phases of the stats queries and the ingestion, count what they move and optionally profile them.
+# Author: Michael Krakovsky
+
+from collections import defaultdict
+from functools import wraps
+from io import StringIO
+from json import dump, dumps
+from logging import getLogger
+from threading import Lock, local, current_thread, main_thread
+from time import perf_counter
+import cProfile
+import pstats
+import tracemalloc
+
+logger = getLogger(__name__)
+_enabled = False                                                         # Checked before any work so disabled phases cost a function call.
+_options = {'log': False, 'profile': False, 'trace_memory': False}
+_metrics = defaultdict(lambda: {'calls': 0, 'seconds': 0.0, 'self_seconds': 0.0, 'max_seconds': 0.0, 'docs': 0, 'rows': 0, 'peak_bytes': 0})
+_lock = Lock()
+_stack = local()
+_profiler = None
+
+class _NullPhase():
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc):
+
+        return False
+
+    def count(self, docs=0, rows=0):
+
+        """
+        Function Description: Ignore the counts while instrumentation is disabled.
+        Function Parameters: docs (Int: The documents read.), rows (Int: The rows built.)
+        Function Throws: Nothing
+        Function Returns: Nothing
+        """
+
+        pass
+
+_null_phase = _NullPhase()
+
+class _Phase():
+
+    def __init__(self, name):
+
+        """
+        Class Description: Time one run of a phase. Phases nest, so each is recorded under the path of the phases it ran within.
+        Class Instantiators: name (String: The name of the phase.)
+        """
+
+        self.name = name
+        self.docs = 0
+        self.rows = 0
+        self.children = 0.0
+
+    def count(self, docs=0, rows=0):
+
+        """
+        Function Description: Add to the documents read and rows built by the phase.
+        Function Parameters: docs (Int: The documents read.), rows (Int: The rows built.)
+        Function Throws: Nothing
+        Function Returns: Nothing
+        """
+
+        self.docs += docs
+        self.rows += rows
+
+    def __enter__(self):
+
+        global _profiler
+        stack = _stack.__dict__.setdefault('phases', [])
+        self.path = '/'.join([phase.name for phase in stack] + [self.name])
+        self.outermost = not stack
+        stack.append(self)
+        if self.outermost and _options['trace_memory'] and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        if self.outermost and _options['profile'] and current_thread() is main_thread():
+            _profiler = _profiler or cProfile.Profile()
+            _profiler.enable()
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+
+        seconds = perf_counter() - self.start
+        if self.outermost and _options['profile'] and current_thread() is main_thread():
+            _profiler.disable()
+        peak = tracemalloc.get_traced_memory()[1] if self.outermost and _options['trace_memory'] and tracemalloc.is_tracing() else 0
+        stack = _stack.phases
+        stack.pop()
+        if stack:
+            stack[-1].children += seconds
+        with _lock:
+            metric = _metrics[self.path]
+            metric['calls'] += 1
+            metric['seconds'] += seconds
+            metric['self_seconds'] += seconds - self.children
+            metric['max_seconds'] = max(metric['max_seconds'], seconds)
+            metric['docs'] += self.docs
+            metric['rows'] += self.rows
+            metric['peak_bytes'] = max(metric['peak_bytes'], peak)
+        if _options['log']:
+            logger.info(dumps({'phase': self.path, 'seconds': round(seconds, 6), 'docs': self.docs, 'rows': self.rows, 'peak_bytes': peak}))
+        return False
+
+def enable(log=False, profile=False, trace_memory=False):
+
+    """
+    Function Description: Start recording the phases.
+    Function Parameters: log (Boolean: Log every finished phase as a JSON line.), profile (Boolean: Run cProfile over the outermost phases of the main thread.),
+        trace_memory (Boolean: Record the peak memory allocated during the outermost phases with tracemalloc.)
+    Function Throws: Nothing
+    Function Returns: Nothing
+    """
+
+    global _enabled
+    _options.update(log=log, profile=profile, trace_memory=trace_memory)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+
+def disable():
+
+    """
+    Function Description: Stop recording the phases. The metrics recorded so far are kept.
+    Function Parameters: Nothing
+    Function Throws: Nothing
+    Function Returns: Nothing
+    """
+
+    global _enabled
+    _enabled = False
+    if _options['trace_memory'] and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+def is_enabled():
+
+    """
+    Function Description: Check whether the phases are being recorded.
+    Function Parameters: Nothing
+    Function Throws: Nothing
+    Function Returns: (Boolean: True if instrumentation is enabled and False otherwise.)
+    """
+
+    return _enabled
+
+def phase(name):
+
+    """
+    Function Description: Time a block of code as a phase. Use as 'with phase("fetch") as p: ... p.count(docs=n)'.
+    Function Parameters: name (String: The name of the phase.)
+    Function Throws: Nothing
+    Function Returns: (Context Manager: The phase, or a shared no-op when instrumentation is disabled.)
+    """
+
+    return _Phase(name) if _enabled else _null_phase
+
+def instrumented(method):
+
+    """
+    Function Description: Decorate a getter or an ingest stage so every call is timed as a phase named after it.
+        The rows of a returned frame and the length of a returned list are counted.
+    Function Parameters: method (Function: The function to time.)
+    Function Throws: Nothing
+    Function Returns: (Function: The timed function.)
+    """
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return method(*args, **kwargs)
+        with _Phase(method.__name__) as timed:
+            result = method(*args, **kwargs)
+            if hasattr(result, 'shape') or isinstance(result, list):
+                timed.count(rows=len(result))
+        return result
+    return wrapper
+
+def snapshot():
+
+    """
+    Function Description: Get the metrics of every phase recorded so far.
+    Function Parameters: Nothing
+    Function Throws: Nothing
+    Function Returns: (Dict: The calls, total, self and slowest seconds, documents, rows and peak bytes of each phase by path.)
+    """
+
+    with _lock:
+        return {path: dict(metric) for path, metric in sorted(_metrics.items())}
+
+def write_snapshot(location):
+
+    """
+    Function Description: Write the metrics of every phase to a JSON file.
+    Function Parameters: location (Path: Where to write the metrics.)
+    Function Throws: Nothing
+    Function Returns: Nothing
+    """
+
+    with open(location, 'w') as f:
+        dump(snapshot(), f, indent=2)
+
+def profile_report(limit=25, sort='cumulative'):
+
+    """
+    Function Description: Summarise the cProfile capture of the outermost phases.
+    Function Parameters: limit (Int: The number of functions listed.), sort (String: The pstats sort key.)
+    Function Throws: Nothing
+    Function Returns: (String: The report, empty when nothing was profiled.)
+    """
+
+    if _profiler is None:
+        return ''
+    output = StringIO()
+    pstats.Stats(_profiler, stream=output).sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+def reset():
+
+    """
+    Function Description: Drop the metrics and the profile recorded so far.
+    Function Parameters: Nothing
+    Function Throws: Nothing
+    Function Returns: Nothing
+    """
+
+    global _profiler
+    with _lock:
+        _metrics.clear()
+    _profiler = None
@@ -0,0 +1,88 @@
+# Description: Share one lazily created MongoDB client, and its connection pool, across the stats and the ingester.
+# Author: Michael Krakovsky
+
+from sys import path
+path.extend('../../../../')                      # Import the entire project.
+from My_Golf_Journey.config import mongo_config
+from pymongo import MongoClient
+from os import getpid
+from threading import Lock
+
+database_name = 'Golf_Stats_DB'
+client_options = {
+    'maxPoolSize': mongo_config.get('max_pool_size', 20),                               # The most sockets open to the server at once.
+    'connectTimeoutMS': mongo_config.get('connect_timeout_ms', 5000),                   # The most time to open a socket.
+    'serverSelectionTimeoutMS': mongo_config.get('server_selection_timeout_ms', 5000),  # The most time to find a server before failing a query.
+    'socketTimeoutMS': mongo_config.get('socket_timeout_ms', 60000)                     # The most time to wait for a reply.
+}
+_client = None
+_client_pid = None
+_lock = Lock()
+
+def configure(**options):
+
+    """
+    Function Description: Change the options of the shared client. A client that is already open is closed so the next query uses them.
+    Function Parameters: options (Keyword Arguments: MongoClient options such as maxPoolSize or socketTimeoutMS.)
+    Function Throws: Nothing
+    Function Returns: Nothing
+    """
+
+    close()
+    client_options.update(options)
+
+def get_client():
+
+    """
+    Function Description: Get the process wide client. It is created on first use and no socket is opened until the first query.
+        A forked worker process gets a client of its own since clients cannot be shared across a fork.
+    Function Parameters: Nothing
+    Function Throws: Nothing
+    Function Returns: (MongoClient: The shared client.)
+    """
+
+    global _client, _client_pid
+    with _lock:
+        if _client is None or _client_pid != getpid():
+            _client = MongoClient(mongo_config['conn_str'], connect=False, **client_options)
+            _client_pid = getpid()
+        return _client
+
+def get_database():
+
+    """
+    Function Description: Get the golf stats database through the shared client.
+    Function Parameters: Nothing
+    Function Throws: Nothing
+    Function Returns: (Database: The golf stats database.)
+    """
+
+    return get_client()[database_name]
+
+def get_scorecards_collection():
+
+    """
+    Function Description: Get the Scorecards collection through the shared client.
+    Function Parameters: Nothing
+    Function Throws: Nothing
+    Function Returns: (Collection: The Scorecards collection.)
+    """
+
+    return get_database().Scorecards
+
+def close():
+
+    """
+    Function Description: Close the shared client and its pool. The next query opens a new one. Stats objects look the collection up on every query
+        and carry on through the new client, while collection handles taken from the old client can no longer be used and must be fetched again.
+    Function Parameters: Nothing
+    Function Throws: Nothing
+    Function Returns: Nothing
+    """
+
+    global _client, _client_pid
+    with _lock:
+        if _client is not None and _client_pid == getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
@@ -0,0 +1,190 @@
+# Description: Memoize the results of the stats queries until a new scorecard is loaded.
+# Author: Michael Krakovsky
+
+from collections import OrderedDict
+from functools import wraps
+from hashlib import sha256
+from pathlib import Path
+from pickle import dump, load, HIGHEST_PROTOCOL
+from threading import Lock
+from time import time
+
+def versions_collection(scorecard_conn):
+
+    """
+    Function Description: Get the collection holding the version stamp of every collection.
+    Function Parameters: scorecard_conn (Collection: The connection to the Scorecards collection.)
+    Function Throws: Nothing
+    Function Returns: (Collection: The connection to the CollectionVersions collection.)
+    """
+
+    return scorecard_conn.database.CollectionVersions
+
+def current_version(scorecard_conn):
+
+    """
+    Function Description: Get the version stamp of the Scorecards collection.
+    Function Parameters: scorecard_conn (Collection: The connection to the Scorecards collection.)
+    Function Throws: Nothing
+    Function Returns: (Int: The version, 0 if the scorecards have never been changed by the ingester.)
+    """
+
+    stamp = versions_collection(scorecard_conn).find_one({'_id': scorecard_conn.name})
+    return stamp['version'] if stamp else 0
+
+def bump_version(scorecard_conn):
+
+    """
+    Function Description: Mark the Scorecards collection as changed so every cached result is recomputed.
+    Function Parameters: scorecard_conn (Collection: The connection to the Scorecards collection.)
+    Function Throws: Nothing
+    Function Returns: Nothing
+    """
+
+    versions_collection(scorecard_conn).update_one({'_id': scorecard_conn.name}, {'$inc': {'version': 1}}, upsert=True)
+
+class QueryCache():
+
+    def __init__(self, max_entries=128, ttl=None, directory=None, max_disk_entries=1024):
+
+        """
+        Class Description: Hold query results in an in-process LRU and optionally in pickle files on disk.
+        Class Instantiators: max_entries (Int: The most results held in memory.), ttl (Float: The seconds a result stays valid. Forever when None.),
+            directory (Path: Where the on-disk tier is kept. Memory only when None.), max_disk_entries (Int: The most results held on disk.)
+        """
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = Path(directory) if directory is not None else None
+        self.max_disk_entries = max_disk_entries
+        self.memory = OrderedDict()
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self.lock = Lock()                                                          # Getters may be fanned out over threads.
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _is_valid(self, entry, version):
+
+        """
+        Function Description: Check that a cached entry is from the current version and has not expired.
+        Function Parameters: entry (Tuple: The version, creation time and value.), version (Int: The current version.)
+        Function Throws: Nothing
+        Function Returns: (Boolean: True if the entry can be used and False otherwise.)
+        """
+
+        entry_version, created, _ = entry
+        return entry_version == version and (self.ttl is None or time() - created < self.ttl)
+
+    def _disk_path(self, key):
+
+        """
+        Function Description: Get the file an entry is kept in on disk.
+        Function Parameters: key (String: The key of the query.)
+        Function Throws: Nothing
+        Function Returns: (Path: The pickle file named after the hash of the key.)
+        """
+
+        return self.directory / (sha256(key.encode('utf-8')).hexdigest() + '.pkl')
+
+    def get(self, key, version):
+
+        """
+        Function Description: Look up a result, first in memory and then on disk.
+        Function Parameters: key (String: The key of the query.), version (Int: The current version of the scorecards.)
+        Function Throws: Nothing
+        Function Returns: (Tuple: True and the value on a hit, False and None on a miss.)
+        """
+
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and self._is_valid(entry, version):
+                self.memory.move_to_end(key)
+                self.counters['memory_hits'] += 1
+                return True, entry[2]
+            self.memory.pop(key, None)
+            if self.directory is not None and self._disk_path(key).exists():
+                try:
+                    with open(self._disk_path(key), 'rb') as f:
+                        entry = load(f)
+                except (OSError, EOFError, ValueError):
+                    entry = None
+                if entry is not None and self._is_valid(entry, version):
+                    self._remember(key, entry)
+                    self.counters['disk_hits'] += 1
+                    return True, entry[2]
+                self._disk_path(key).unlink(missing_ok=True)
+            self.counters['misses'] += 1
+            return False, None
+
+    def _remember(self, key, entry):
+
+        """
+        Function Description: Hold an entry in memory, evicting the least recently used entries past the size limit.
+        Function Parameters: key (String: The key of the query.), entry (Tuple: The version, creation time and value.)
+        Function Throws: Nothing
+        Function Returns: Nothing
+        """
+
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def put(self, key, version, value):
+
+        """
+        Function Description: Store a result in memory and on disk.
+        Function Parameters: key (String: The key of the query.), version (Int: The current version of the scorecards.), value (Object: The result.)
+        Function Throws: Nothing
+        Function Returns: Nothing
+        """
+
+        with self.lock:
+            entry = (version, time(), value)
+            self._remember(key, entry)
+            if self.directory is not None:
+                with open(self._disk_path(key), 'wb') as f:
+                    dump(entry, f, protocol=HIGHEST_PROTOCOL)
+                files = sorted(self.directory.glob('*.pkl'), key=lambda file: file.stat().st_mtime)
+                for file in files[:max(0, len(files) - self.max_disk_entries)]:         # Evict the oldest files past the size limit.
+                    file.unlink(missing_ok=True)
+
+    def clear(self):
+
+        """
+        Function Description: Drop every cached result and reset the counters.
+        Function Parameters: Nothing
+        Function Throws: Nothing
+        Function Returns: Nothing
+        """
+
+        with self.lock:
+            self.memory.clear()
+            self.counters = dict.fromkeys(self.counters, 0)
+            if self.directory is not None:
+                for file in self.directory.glob('*.pkl'):
+                    file.unlink(missing_ok=True)
+
+def cached_stat(method):
+
+    """
+    Function Description: Decorate a Stats getter so its results are read from the Stats query cache while the scorecards are unchanged.
+        Results are kept apart by the server and collection they were read from. Copies are returned so callers can change the results freely.
+    Function Parameters: method (Function: The Stats getter.)
+    Function Throws: Nothing
+    Function Returns: (Function: The cached getter.)
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.query_cache is None or self.source == 'cache':                    # The local hole cache is already offline.
+            return method(self, *args, **kwargs)
+        version = current_version(self.collection)
+        key = repr((method.__name__, self.source, self.collection.database.client.address, self.collection.full_name, args,
+            sorted(kwargs.items())))                                              # Stats of other databases may share the cache and its files.
+        hit, value = self.query_cache.get(key, version)
+        if not hit:
+            value = method(self, *args, **kwargs)
+            self.query_cache.put(key, version, value)
+        return value.copy()
+    return wrapper
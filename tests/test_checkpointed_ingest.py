@@ -0,0 +1,132 @@
+# Script Description: Unit testing for resumable ingestion that only rewrites new or edited scorecards.
+
+
+import unittest
+from sys import path
+from json import loads
+from tempfile import TemporaryDirectory
+from pathlib import Path
+from unittest.mock import patch
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.garmin_scrapper import scorecard_store
+from My_Golf_Journey.src.bin.garmin_scrapper.checkpointed_ingest import Checkpoint, Quarantine, sync_scorecards
+try:
+    from mongomock import MongoClient
+except ImportError:
+    MongoClient = None
+
+module = 'My_Golf_Journey.src.bin.garmin_scrapper.checkpointed_ingest.'
+
+def scorecard(id, strokes=80, modified='2020-09-16T23:18:11.000Z'):
+
+    return {'scorecardDetails': [{'scorecard': {'id': id, 'strokes': strokes, 'lastModifiedDt': modified}}], 'courseSnapshots': []}
+
+class Test_Checkpointed_Ingest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = TemporaryDirectory()
+        self.location = Path(self.directory.name) / 'checkpoint.json'
+        self.quarantine = Quarantine(Path(self.directory.name) / 'quarantine')
+        self.garmin = {1: scorecard(1), 2: scorecard(2), 3: scorecard(3)}
+        self.written = []
+        self.fetched = []
+        self.stored = {}
+        patches = {
+            'fetch_scorecards': self.fetch,
+            'find_missing_ids': lambda ids, conn: list(ids),
+            'stored_modified_times': lambda ids, conn: {id: self.stored[id] for id in ids if id in self.stored},
+            'bulk_upsert_scorecards': self.upsert
+        }
+        self.patchers = [patch(module + name, side_effect=function) for name, function in patches.items()]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+
+        for patcher in self.patchers:
+            patcher.stop()
+        self.directory.cleanup()
+
+    def fetch(self, session, ids, **kwargs):
+
+        self.fetched.extend(ids)
+        return {id: self.garmin[id] for id in ids if id in self.garmin}, {id: ValueError('missing') for id in ids if id not in self.garmin}
+
+    def upsert(self, docs, conn):
+
+        ids = [doc['scorecardDetails'][0]['scorecard']['id'] for doc in docs]
+        self.written.extend(ids)
+        self.stored.update((id, doc['scorecardDetails'][0]['scorecard']['lastModifiedDt']) for id, doc in zip(ids, docs))
+        return ids, [], {}
+
+    def test_only_changes_are_written(self):
+
+        """
+        Unit Test sync_scorecards to ensure a refresh only writes the scorecards edited since the last run and quarantines failures.
+        """
+
+        counts = sync_scorecards(None, [1, 2, 3, 4], None, Checkpoint(self.location), self.quarantine)
+        self.assertEqual(counts['inserted'], 3)
+        self.assertEqual(counts['failed'], 1)
+        self.assertEqual(loads(self.quarantine.location.read_text().splitlines()[0])['id'], 4)
+        self.garmin[2] = scorecard(2, strokes=79, modified='2020-09-17T08:00:00.000Z')
+        self.written = []
+        counts = sync_scorecards(None, [1, 2, 3], None, Checkpoint(self.location), self.quarantine, refresh=True)
+        self.assertEqual(self.written, [2])
+        self.assertEqual(counts['unchanged'], 2)
+        self.assertFalse(Checkpoint(self.location).in_progress())
+
+    def test_resume(self):
+
+        """
+        Unit Test sync_scorecards to ensure a run that crashed resumes after the last checkpoint with the ids it parsed.
+        """
+
+        def crash(docs, conn):
+            if self.written:
+                raise RuntimeError('crash')
+            return self.upsert(docs, conn)
+
+        with patch(module + 'bulk_upsert_scorecards', side_effect=crash):
+            with self.assertRaises(RuntimeError):
+                sync_scorecards(None, [1, 2, 3], None, Checkpoint(self.location), self.quarantine, step=1)
+        checkpoint = Checkpoint(self.location)
+        self.assertTrue(checkpoint.in_progress())
+        self.fetched = []
+        sync_scorecards(None, [], None, checkpoint, self.quarantine, step=1)
+        self.assertEqual(self.fetched, [2, 3])
+        self.assertEqual(self.written, [1, 2, 3])
+
+    @unittest.skipIf(MongoClient is None, 'mongomock is not installed.')
+    def test_missing_scorecards_are_rewritten(self):
+
+        """
+        Unit Test sync_scorecards to ensure scorecards missing from the collection are written again even when the checkpoint holds their hash.
+        """
+
+        collection = MongoClient().golf.Scorecards
+        stores = [patch(module + name, side_effect=getattr(scorecard_store, name)) for name in ['find_missing_ids', 'stored_modified_times', 'bulk_upsert_scorecards']]
+        for store in stores:
+            store.start()
+        try:
+            self.assertEqual(sync_scorecards(None, [1, 2], collection, Checkpoint(self.location), self.quarantine)['inserted'], 2)
+            collection.drop()
+            counts = sync_scorecards(None, [1, 2], collection, Checkpoint(self.location), self.quarantine)
+            self.assertEqual((counts['inserted'], counts['unchanged']), (2, 0))
+            self.assertEqual(collection.count_documents({}), 2)
+            collection.delete_one({'scorecardDetails.scorecard.id': 1})
+            counts = sync_scorecards(None, [1, 2], collection, Checkpoint(self.location), self.quarantine, refresh=True)
+            self.assertEqual((counts['inserted'], counts['unchanged']), (1, 1))
+            self.assertEqual(collection.count_documents({}), 2)
+        finally:
+            for store in stores:
+                store.stop()
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')
@@ -0,0 +1,115 @@
+# Script Description: Unit testing for the charts, plot data and batch rendering of the Grapher.
+
+
+import unittest
+from sys import path
+from tempfile import TemporaryDirectory
+from pathlib import Path
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.graphing.display import Grapher, course_trends, downsample
+from pandas import DataFrame, MultiIndex, concat, date_range
+
+def summary(course_id=None):
+
+    holes = range(1, 19)
+    df = DataFrame({'putting_average': 2.0, 'scoring_average': [4.5 + hole % 3 for hole in holes], 'Par': [4 + hole % 3 for hole in holes],
+        'fairway_accuracy': 0.5, 'green_accuracy': 0.25}, index=holes).astype({'Par': 'UInt8'})
+    if course_id is not None:
+        df.index = MultiIndex.from_product([[course_id], holes], names=['course_id', 'hole'])
+    return df
+
+def rounds(course_ids, count):
+
+    df = DataFrame({'scorecard_id': range(count * len(course_ids)), 'course_id': [course_id for _ in range(count) for course_id in course_ids],
+        'start_time': date_range('2020-01-01', periods=count * len(course_ids)), 'score': [80.0 + i % 7 for i in range(count * len(course_ids))],
+        'putts': 32.0, 'fir': 0.5, 'gir': 0.25})
+    return df.join(df[['score', 'putts', 'fir', 'gir']].rolling(5, min_periods=1).mean().add_suffix('_avg'))
+
+class Fake_Stats():
+
+    source = 'cache'
+    holes = []
+
+    def __init__(self):
+
+        self.calls = []
+
+    def get_course_summary(self, course_id, holes=18, start=None, end=None):
+
+        self.calls.append('get_course_summary')
+        return summary()
+
+    def get_course_summaries(self, course_ids=None, holes=18, start=None, end=None):
+
+        self.calls.append('get_course_summaries')
+        return concat([summary(course_id) for course_id in course_ids if course_id != 3])            # Course 3 has no full round.
+
+    def get_rolling_trend(self, course_id=None, window=5, holes=18, start=None, end=None):
+
+        self.calls.append('get_rolling_trend')
+        return rounds(course_id if isinstance(course_id, list) else [course_id], 30)
+
+    def get_course_ids(self):
+
+        return [1, 2, 3]
+
+class Test_Display(unittest.TestCase):
+
+    def test_downsample(self):
+
+        """
+        Unit Test downsample to ensure a long trend is averaged into at most max_points buckets dated by their last round.
+        """
+
+        trend = rounds([1], 1000)
+        sampled = downsample(trend, 100)
+        self.assertEqual(len(sampled), 100)
+        self.assertEqual(list(sampled.columns), list(trend.columns))
+        self.assertAlmostEqual(sampled['score'].mean(), trend['score'].mean())
+        self.assertEqual(sampled['start_time'].iloc[-1], trend['start_time'].iloc[-1])
+        self.assertIs(downsample(trend, 1000), trend)
+
+    def test_course_trends(self):
+
+        """
+        Unit Test course_trends to ensure the moving averages are taken within each course.
+        """
+
+        trend = course_trends(rounds([1, 2], 10), 3)
+        course = trend[trend['course_id'] == 2]
+        self.assertEqual(list(course['score_avg']), list(course['score'].rolling(3, min_periods=1).mean()))
+
+    def test_plot_data_cache(self):
+
+        """
+        Unit Test the Grapher to ensure the plot data is derived once and drawn as bars with the par marked.
+        """
+
+        stats = Fake_Stats()
+        grapher = Grapher(stats, max_points=10)
+        ax = grapher.plot_holes(17772, 'score')
+        self.assertEqual(len(ax.patches), 18)
+        grapher.plot_holes(17772, 'gir')
+        self.assertEqual(len(grapher.plot_trend(17772, 'putts').lines[0].get_xdata()), 10)
+        self.assertEqual(stats.calls, ['get_course_summary', 'get_rolling_trend'])
+
+    def test_render_all_courses(self):
+
+        """
+        Unit Test render_all_courses to ensure every course is rendered to files from two queries and a course without data is skipped.
+        """
+
+        stats = Fake_Stats()
+        with TemporaryDirectory() as directory:
+            saved = Grapher(stats).render_all_courses(directory, workers=2)
+            self.assertEqual(sorted(path.name for path in Path(directory).iterdir()), ['1_holes.png', '1_trend.png', '2_holes.png', '2_trend.png', '3_trend.png'])
+        self.assertEqual(len(saved[1]), 2)
+        self.assertEqual(stats.calls, ['get_course_summaries', 'get_rolling_trend'])
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')
@@ -0,0 +1,120 @@
+# Script Description: Unit testing for the concurrent scorecard fetcher against a local stub of the Garmin API.
+
+
+import unittest
+from sys import path
+from json import dumps
+from time import monotonic
+from threading import Thread, Lock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from requests import Session
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.garmin_scrapper.fetch_engine import TokenBucket, fetch_scorecards
+
+class Stub_Garmin_Handler(BaseHTTPRequestHandler):
+
+    requests_seen = []
+    batches_seen = []
+    lock = Lock()
+    flaky_ids = {'2'}                                                      # Scorecards that fail once before succeeding.
+    missing_ids = {'3'}                                                    # Scorecards that Garmin leaves out of the response.
+    malformed_bodies = {'7': b'<html></html>', '8': b'[]', '9': b'{"scorecardDetails": [null]}'}    # Responses that are not scorecard details.
+
+    def do_GET(self):
+
+        ids = parse_qs(urlparse(self.path).query)['scorecard-ids'][0].split(',')
+        with self.lock:
+            first_attempt = not any(id in self.requests_seen for id in ids)
+            self.requests_seen.extend(ids)
+            self.batches_seen.append(ids)
+        if any(id in self.flaky_ids for id in ids) and first_attempt:
+            self.send_response(503)
+            self.end_headers()
+            return
+        found = [int(id) for id in ids if id not in self.missing_ids]
+        body = dumps({'scorecardDetails': [{'scorecard': {'id': id, 'courseGlobalId': 100 + id}} for id in found],
+            'courseSnapshots': [{'courseGlobalId': 100 + id} for id in found]}).encode('utf-8')
+        body = next((self.malformed_bodies[id] for id in ids if id in self.malformed_bodies), body)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+
+        pass
+
+class Test_Fetch_Engine(unittest.TestCase):
+
+    def setUp(self):
+
+        Stub_Garmin_Handler.requests_seen = []
+        Stub_Garmin_Handler.batches_seen = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Stub_Garmin_Handler)
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = 'http://127.0.0.1:{}/scorecard/detail?scorecard-ids={{}}'.format(self.server.server_port)
+
+    def tearDown(self):
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_fetch_scorecards(self):
+
+        """
+        Unit Test fetch_scorecards to ensure every scorecard is fetched, retried when Garmin fails and reported when missing.
+        """
+
+        scorecards, failures = fetch_scorecards(Session(), [1, 2, 3, 4, 5], url=self.url, batch_size=1, rate=100, concurrency=3, retries=2, backoff=0.01)
+        self.assertEqual(sorted(scorecards), [1, 2, 4, 5])
+        self.assertEqual(scorecards[2]['scorecardDetails'][0]['scorecard']['id'], 2)
+        self.assertEqual(list(failures), [3])
+        self.assertEqual(Stub_Garmin_Handler.requests_seen.count('2'), 2)          # Retried once after the 503.
+        self.assertEqual(Stub_Garmin_Handler.requests_seen.count('3'), 1)          # A missing scorecard is not retried.
+
+    def test_fetch_scorecards_in_batches(self):
+
+        """
+        Unit Test fetch_scorecards to ensure a batch is fetched with one request and split into one document per scorecard.
+        """
+
+        scorecards, failures = fetch_scorecards(Session(), [1, 3, 4, 5, 6], url=self.url, batch_size=3, rate=100, concurrency=2, retries=2, backoff=0.01)
+        self.assertEqual(sorted(Stub_Garmin_Handler.batches_seen), [['1', '3', '4'], ['5', '6']])
+        self.assertEqual(sorted(scorecards), [1, 4, 5, 6])
+        self.assertEqual(list(failures), [3])
+        document = scorecards[4]
+        self.assertEqual(len(document['scorecardDetails']), 1)
+        self.assertEqual(document['courseSnapshots'], [{'courseGlobalId': 104}])
+
+    def test_malformed_responses(self):
+
+        """
+        Unit Test fetch_scorecards to ensure a response that is not scorecard details fails its own batch and the other batches are kept.
+        """
+
+        scorecards, failures = fetch_scorecards(Session(), [1, 7, 8, 9, 4, 5], url=self.url, batch_size=2, rate=100, concurrency=2, retries=0)
+        self.assertEqual(sorted(scorecards), [4, 5])
+        self.assertEqual(sorted(failures), [1, 7, 8, 9])
+        self.assertIsInstance(failures[8], ValueError)
+
+    def test_token_bucket(self):
+
+        """
+        Unit Test the TokenBucket to ensure it holds back requests beyond its rate.
+        """
+
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(monotonic() - start, 0.09)
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')
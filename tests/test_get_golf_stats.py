@@ -4,7 +4,8 @@
 import unittest
 from sys import path
 path.extend('../')                                                        # Import the entire project.
-from My_Golf_Journey.src.bin.stat_apis.get_golf_stats import Stats
+from My_Golf_Journey.src.bin.stat_apis.get_golf_stats import Stats, round_filter, summary_columns
+from datetime import date
 
 class Test_Get_Golf_Stats(unittest.TestCase):        
 
@@ -35,6 +36,29 @@ class Test_Get_Golf_Stats(unittest.TestCase):
         self.assertFalse(self.s._is_hit(caledon_pars, 3, 2, 0))
         self.assertTrue(self.s._is_hit(caledon_pars, 3, 2, 1))
 
+    def test_is_hit(self):
+
+        """
+        Unit Test the batch 'is_hit' method against the regulation rules of the single hole '_is_hit' method.
+        """
+
+        caledon_pars = self.s.get_hole_pars(17772)
+        holes, strokes, putts = [], [], []
+        for hole in caledon_pars.index:
+            for stroke in range(1, 9):
+                for putt in range(0, stroke):
+                    holes.append(hole)
+                    strokes.append(stroke)
+                    putts.append(putt)
+        results = self.s.is_hit(caledon_pars.loc[holes, 'Par'], strokes, putts)
+        for hole, stroke, putt, result in zip(holes, strokes, putts, results):
+            hole_par = int(caledon_pars.loc[hole, 'Par'])
+            allowed = 3 if hole_par == 5 else 2 if hole_par == 4 else 1
+            self.assertEqual(stroke - putt <= allowed, result)
+            self.assertEqual(self.s._is_hit(caledon_pars, hole, stroke, putt), result)
+        self.assertFalse(self.s.is_hit([4], [5], [float('nan')])[0])
+        self.assertFalse(self.s.is_hit([float('nan')], [2], [1])[0])                # A hole beyond the course pars is a miss.
+
     def test_get_fairways(self):
 
         """
@@ -77,6 +101,81 @@ class Test_Get_Golf_Stats(unittest.TestCase):
         row = df.loc[(df['outcome'] == 'HIT') & (df['hole'] == 1)]
         self.assertEqual(results[0]['count'], row.iloc[0]['count'])
 
+    def test_get_course_summary(self):
+
+        """
+        Unit Test get_course_summary against the stats computed one aggregation at a time.
+        """
+
+        summary = self.s.get_course_summary(17772)
+        putts = self.s.get_putting_avg_by_hole(17772)
+        greens = self.s.get_green_accuracy(17772)
+        self.assertEqual(len(summary), 18)
+        for hole in summary.index:
+            self.assertAlmostEqual(summary.loc[hole, 'putting_average'], putts.loc[hole, 'putting_average'])
+            self.assertEqual(summary.loc[hole, 'green_hit_count'], greens.loc[hole, 'hit_count'])
+            self.assertEqual(summary.loc[hole, 'green_attempt'], greens.loc[hole, 'attempt'])
+
+    def test_get_course_summaries(self):
+
+        """
+        Unit Test get_course_summaries against the summary of a single course and the thread pool fan out.
+        """
+
+        summaries = self.s.get_course_summaries([17772])
+        summary = self.s.get_course_summary(17772)
+        self.assertEqual(summaries.index.names, ['course_id', 'hole'])
+        for hole in summary.index:
+            self.assertAlmostEqual(summaries.loc[(17772, hole), 'scoring_average'], summary.loc[hole, 'scoring_average'])
+            self.assertEqual(summaries.loc[(17772, hole), 'green_hit_count'], summary.loc[hole, 'green_hit_count'])
+        fanned = self.s.get_by_course('get_course_summary', [17772])
+        self.assertEqual(len(fanned), len(summaries))
+
+    def test_round_filter(self):
+
+        """
+        Unit Test round_filter to ensure the date bounds are compared as the ISO strings the start times are stored in.
+        """
+
+        self.assertEqual(round_filter(17772), {'courseSnapshots.courseGlobalId': 17772})
+        self.assertEqual(round_filter(None, date(2019, 5, 1), '2019-06-01'),
+            {'scorecardDetails.scorecard.startTime': {'$gte': '2019-05-01', '$lt': '2019-06-01'}})
+
+    def test_date_filters(self):
+
+        """
+        Unit Test the date filters to ensure the rounds of a season add up to the rounds of every season.
+        """
+
+        everything = self.s.get_course_summary(17772)
+        seasons = [self.s.get_course_summary(17772, end='2019-01-01'), self.s.get_course_summary(17772, start='2019-01-01')]
+        for hole in everything.index:
+            self.assertEqual(everything.loc[hole, 'green_attempt'], sum(season.loc[hole, 'green_attempt'] for season in seasons if hole in season.index))
+
+    def test_empty_date_window(self):
+
+        """
+        Unit Test the getters to ensure a date range without rounds returns empty frames with their usual columns.
+        """
+
+        window = {'start': '2030-01-01'}
+        self.assertEqual(list(self.s.get_putting_avg_by_hole(17772, **window).columns), ['putting_average'])
+        self.assertEqual(list(self.s.get_scoring_avg_by_hole(17772, **window).columns), ['scoring_average', 'Par'])
+        self.assertEqual(list(self.s.get_course_summary(17772, **window).columns), summary_columns)
+        for getter in ['get_putting_avg_by_hole', 'get_scoring_avg_by_hole', 'get_course_summary', 'get_fairways', 'get_fairway_accuracy', 'get_green_accuracy']:
+            self.assertTrue(getattr(self.s, getter)(17772, **window).empty)
+
+    def test_get_rolling_trend(self):
+
+        """
+        Unit Test get_rolling_trend to ensure the rounds are in order and the first average is the first round.
+        """
+
+        trend = self.s.get_rolling_trend(17772, window=3)
+        self.assertTrue(trend['start_time'].is_monotonic_increasing)
+        self.assertEqual(trend.loc[0, 'score_avg'], trend.loc[0, 'score'])
+        self.assertAlmostEqual(trend.loc[2, 'putts_avg'], trend.loc[0:2, 'putts'].mean())
+
 if __name__ == '__main__':
     
     try:
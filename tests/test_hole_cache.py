@@ -0,0 +1,63 @@
+# Script Description: Unit testing for the local columnar cache of the holes played.
+
+
+import unittest
+from sys import path
+from tempfile import TemporaryDirectory
+from pathlib import Path
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis.hole_cache import HoleCache
+
+class Scorecard_Holes():
+
+    def __init__(self, records):
+
+        """
+        Class Description: Stand in for the Scorecards collection that returns the unwound hole records.
+        Class Instantiators: records (List: The hole records returned by every aggregation.)
+        """
+
+        self.records = records
+        self.queries = []
+
+    def aggregate(self, query, **kwargs):
+
+        self.queries.append(query)
+        return iter(self.records)
+
+class Test_Hole_Cache(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = TemporaryDirectory()
+        self.cache = HoleCache(Path(self.directory.name) / 'holes.parquet')
+        self.records = [{'scorecard_id': 1, 'course_id': 17772, 'start_time': '2020-10-18T14:35:00.0', 'holes_completed': 18,
+            'hole': hole, 'strokes': 5, 'putts': 2, 'fairway': 'HIT', 'par': 4} for hole in range(1, 19)]
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def test_refresh(self):
+
+        """
+        Unit Test refresh to ensure the cache only adds scorecards past the watermark and keeps its narrow dtypes.
+        """
+
+        collection = Scorecard_Holes(self.records)
+        self.assertEqual(self.cache.refresh(collection), 18)
+        self.assertEqual(self.cache.refresh(collection), 0)                # The same scorecard is not added twice.
+        self.assertEqual(collection.queries[1][0], {'$match': {'scorecardDetails.scorecard.startTime': {'$gte': '2020-10-18'}}})
+        holes = self.cache.load()
+        self.assertEqual(len(holes), 18)
+        self.assertEqual(str(holes['hole'].dtype), 'uint8')
+        self.assertEqual(str(holes['fairway'].dtype), 'category')
+        self.assertEqual(self.cache.watermark().strftime('%Y-%m-%d'), '2020-10-18')
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')
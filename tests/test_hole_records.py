@@ -0,0 +1,47 @@
+# Script Description: Unit testing for streaming hole records into the compact schema.
+
+
+import unittest
+from sys import path
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis.hole_records import frame_from_cursor, hole_schema
+
+class Test_Hole_Records(unittest.TestCase):
+
+    def setUp(self):
+
+        self.records = [{'scorecard_id': 1, 'course_id': 17772, 'start_time': '2020-10-18T14:35:00.0', 'holes_completed': 18,
+            'hole': hole, 'strokes': 5, 'putts': 2, 'par': 4, 'fairway': 'HIT' if hole < 10 else 'LEFT'} for hole in range(1, 19)]
+
+    def test_batches(self):
+
+        """
+        Unit Test frame_from_cursor to ensure batches are joined in order with the schema dtypes and every fairway outcome.
+        """
+
+        del self.records[2]['strokes']                                    # A hole saved without a score.
+        df = frame_from_cursor(iter(self.records), batch_size=4)
+        self.assertEqual(df['hole'].tolist(), list(range(1, 19)))
+        self.assertEqual({name: str(dtype) for name, dtype in df.dtypes.items()}, hole_schema)
+        self.assertEqual(sorted(df['fairway'].cat.categories), ['HIT', 'LEFT'])
+        self.assertTrue(df['strokes'].isna()[2])
+        self.assertEqual(df['strokes'].sum(), 85)
+
+    def test_empty(self):
+
+        """
+        Unit Test frame_from_cursor to ensure an empty cursor still has the schema dtypes.
+        """
+
+        df = frame_from_cursor(iter([]))
+        self.assertTrue(df.empty)
+        self.assertEqual(list(df.columns), list(hole_schema))
+        self.assertEqual(str(df['par'].dtype), 'UInt8')
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')
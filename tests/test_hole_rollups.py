@@ -0,0 +1,69 @@
+# Script Description: Unit testing for the per hole rollups that are updated when a scorecard is inserted.
+
+
+import unittest
+from sys import path
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis.hole_rollups import hole_increments, rebuild_rollups, rollups_collection
+from My_Golf_Journey.src.bin.stat_apis.index_advisor import ensure_indexes
+try:
+    from mongomock import MongoClient
+except ImportError:
+    MongoClient = None
+
+class Test_Hole_Rollups(unittest.TestCase):
+
+    def setUp(self):
+
+        self.scorecard = {
+            'scorecardDetails': [{'scorecard': {'courseGlobalId': 17772, 'holes': [
+                {'number': 1, 'strokes': 4, 'putts': 2, 'fairwayShotOutcome': 'HIT'},
+                {'number': 2, 'strokes': 6, 'putts': 1, 'fairwayShotOutcome': 'LEFT'},
+                {'number': 3, 'strokes': 3},
+                {'number': 4, 'strokes': 4, 'putts': 2, 'fairwayShotOutcome': None}
+            ]}}],
+            'courseSnapshots': [{'courseGlobalId': 17772, 'holePars': '4534'}]
+        }
+
+    def test_hole_increments(self):
+
+        """
+        Unit Test hole_increments to ensure every hole counts its strokes, putts, fairway and green.
+        """
+
+        increments = hole_increments(self.scorecard)
+        self.assertEqual(sorted(increments), [(17772, 1), (17772, 2), (17772, 3), (17772, 4)])
+        first = increments[(17772, 1)]
+        self.assertEqual(first['par'], 4)
+        self.assertEqual(first['counts']['strokes_sum'], 4)
+        self.assertEqual(first['counts']['fairway.HIT'], 1)
+        self.assertEqual(first['counts']['green_hit'], 1)
+        self.assertEqual(increments[(17772, 2)]['counts']['green_hit'], 0)
+        third = increments[(17772, 3)]['counts']
+        self.assertEqual(third['putts_count'], 0)                            # Missing putts do not count towards the putting average.
+        self.assertEqual(third['fairway.NO_ENTRY'], 1)
+        self.assertEqual(third['green_hit'], 0)
+        self.assertEqual(increments[(17772, 4)]['counts']['fairway.NO_ENTRY'], 1)             # A null outcome is no entry, as in the Mongo source.
+
+    @unittest.skipIf(MongoClient is None, 'mongomock is not installed.')
+    def test_rebuild_rollups(self):
+
+        """
+        Unit Test rebuild_rollups to ensure the rollups are rewritten from the scorecards and keep their indexes.
+        """
+
+        collection = MongoClient().golf.Scorecards
+        collection.insert_one(self.scorecard)
+        ensure_indexes(collection)
+        rollups_collection(collection).insert_one({'_id': {'course_id': 1, 'hole': 1}, 'course_id': 1, 'hole': 1, 'rounds': 5})
+        self.assertEqual(rebuild_rollups(collection), 4)
+        self.assertEqual(sorted(rollups_collection(collection).distinct('course_id')), [17772])
+        self.assertIn('course_id', rollups_collection(collection).index_information())
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')
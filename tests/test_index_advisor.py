@@ -0,0 +1,37 @@
+# Script Description: Unit testing for the summaries of the query plans of the stats queries.
+
+
+import unittest
+from sys import path
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis.index_advisor import summarise_plan
+
+class Test_Index_Advisor(unittest.TestCase):
+
+    def test_summarise_index_scan(self):
+
+        """
+        Unit Test summarise_plan on an aggregation that uses the course index.
+        """
+
+        explain = {'stages': [{'$cursor': {
+            'queryPlanner': {'winningPlan': {'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN', 'indexName': 'course_id'}}},
+            'executionStats': {'nReturned': 135, 'totalDocsExamined': 135}}}, {'$unwind': {'path': '$scorecardDetails'}}]}
+        self.assertEqual(summarise_plan(explain), {'scan': 'IXSCAN', 'indexes': ['course_id'], 'docs_examined': 135, 'returned': 135})
+
+    def test_summarise_collection_scan(self):
+
+        """
+        Unit Test summarise_plan on an aggregation that scans the whole collection.
+        """
+
+        explain = {'queryPlanner': {'winningPlan': {'stage': 'COLLSCAN'}}, 'executionStats': {'nReturned': 135, 'totalDocsExamined': 2400}}
+        self.assertEqual(summarise_plan(explain), {'scan': 'COLLSCAN', 'indexes': [], 'docs_examined': 2400, 'returned': 135})
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')
@@ -0,0 +1,90 @@
+# Script Description: Unit testing for the phase timers, counts and profiles of the instrumentation.
+
+
+import unittest
+from sys import path
+from json import loads
+from threading import Thread
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis import instrumentation
+from My_Golf_Journey.src.bin.stat_apis.instrumentation import instrumented, phase
+from pandas import DataFrame
+
+@instrumented
+def get_rows(n):
+
+    with phase('aggregate') as aggregate:
+        docs = [{'hole': hole} for hole in range(n)]
+        aggregate.count(docs=len(docs))
+    return DataFrame(docs)
+
+class Test_Instrumentation(unittest.TestCase):
+
+    def setUp(self):
+
+        instrumentation.reset()
+
+    def tearDown(self):
+
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled(self):
+
+        """
+        Unit Test phase and instrumented to ensure nothing is recorded and a shared no-op is used while disabled.
+        """
+
+        self.assertIs(phase('a'), phase('b'))
+        self.assertEqual(len(get_rows(3)), 3)
+        self.assertEqual(instrumentation.snapshot(), {})
+
+    def test_nested_phases(self):
+
+        """
+        Unit Test instrumented to ensure nested phases are recorded under their path with their counts and self time.
+        """
+
+        instrumentation.enable()
+        get_rows(18)
+        get_rows(9)
+        metrics = instrumentation.snapshot()
+        self.assertEqual(set(metrics), {'get_rows', 'get_rows/aggregate'})
+        self.assertEqual(metrics['get_rows']['calls'], 2)
+        self.assertEqual(metrics['get_rows']['rows'], 27)
+        self.assertEqual(metrics['get_rows/aggregate']['docs'], 27)
+        self.assertAlmostEqual(metrics['get_rows']['self_seconds'], metrics['get_rows']['seconds'] - metrics['get_rows/aggregate']['seconds'])
+
+    def test_threads(self):
+
+        """
+        Unit Test phase to ensure each thread nests its phases separately.
+        """
+
+        instrumentation.enable()
+        with phase('main'):
+            worker = Thread(target=get_rows, args=(4,))
+            worker.start()
+            worker.join()
+        self.assertEqual(set(instrumentation.snapshot()), {'main', 'get_rows', 'get_rows/aggregate'})
+
+    def test_exports(self):
+
+        """
+        Unit Test the structured logs, the cProfile report and the tracemalloc peaks.
+        """
+
+        instrumentation.enable(log=True, profile=True, trace_memory=True)
+        with self.assertLogs(instrumentation.logger, level='INFO') as logs:
+            get_rows(1000)
+        self.assertEqual([loads(line.split(':', 2)[2])['phase'] for line in logs.output], ['get_rows/aggregate', 'get_rows'])
+        self.assertGreater(instrumentation.snapshot()['get_rows']['peak_bytes'], 0)
+        self.assertIn('get_rows', instrumentation.profile_report())
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')
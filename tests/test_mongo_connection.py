@@ -0,0 +1,65 @@
+# Script Description: Unit testing for the shared MongoDB client.
+
+
+import unittest
+from sys import path
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis import mongo_connection
+from My_Golf_Journey.src.bin.stat_apis.get_golf_stats import Stats
+
+class Test_Mongo_Connection(unittest.TestCase):
+
+    def setUp(self):
+
+        self.options = dict(mongo_connection.client_options)
+
+    def tearDown(self):
+
+        mongo_connection.configure(**self.options)
+
+    def test_shared_client(self):
+
+        """
+        Unit Test get_client to ensure every Stats object shares one client.
+        """
+
+        client = mongo_connection.get_client()
+        self.assertIs(mongo_connection.get_client(), client)
+        self.assertIs(Stats().collection.database.client, client)
+        self.assertIs(Stats(source='rollups').rollups.database.client, client)
+
+    def test_configure_and_close(self):
+
+        """
+        Unit Test configure and close to ensure a new client with the new options is made on next use.
+        """
+
+        client = mongo_connection.get_client()
+        mongo_connection.configure(maxPoolSize=5)
+        self.assertIsNone(mongo_connection._client)
+        new_client = mongo_connection.get_client()
+        self.assertIsNot(new_client, client)
+        self.assertEqual(new_client.options.pool_options.max_pool_size, 5)
+        mongo_connection.close()
+        self.assertIsNone(mongo_connection._client)
+
+    def test_reconnect_after_close(self):
+
+        """
+        Unit Test Stats to ensure an object made before close or configure queries through the new client.
+        """
+
+        stats = Stats()
+        client = stats.collection.database.client
+        mongo_connection.close()
+        self.assertIsNot(stats.collection.database.client, client)
+        mongo_connection.configure(maxPoolSize=5)
+        self.assertIs(stats.rollups.database.client, mongo_connection.get_client())
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')
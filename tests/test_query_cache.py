@@ -0,0 +1,133 @@
+# Script Description: Unit testing for the memoized results of the stats queries.
+
+
+import unittest
+from sys import path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.stat_apis.query_cache import QueryCache, cached_stat
+
+class Fake_Stats():
+
+    def __init__(self, query_cache, full_name='golf.Scorecards', address=('localhost', 27017)):
+
+        """
+        Class Description: Stand in for Stats with a getter that counts its calls and a version that can be bumped.
+        Class Instantiators: query_cache (QueryCache: The cache under test.), full_name (String: The name of the collection read.),
+            address (Tuple: The host and port of the server read.)
+        """
+
+        self.query_cache = query_cache
+        self.source = 'mongo'
+        self.collection = Mock(full_name=full_name, **{'database.client.address': address})
+        self.version = 0
+        self.calls = 0
+
+    @cached_stat
+    def get_stat(self, course_id):
+
+        self.calls += 1
+        return [course_id, self.calls]
+
+class Test_Query_Cache(unittest.TestCase):
+
+    def setUp(self):
+
+        self.patcher = patch('My_Golf_Journey.src.bin.stat_apis.query_cache.current_version', lambda conn: self.stats.version)
+        self.patcher.start()
+        self.stats = Fake_Stats(QueryCache(max_entries=2))
+
+    def tearDown(self):
+
+        self.patcher.stop()
+
+    def test_hit_and_copy(self):
+
+        """
+        Unit Test cached_stat to ensure repeat calls are served from memory as copies.
+        """
+
+        first = self.stats.get_stat(1)
+        first.append('changed')
+        self.assertEqual(self.stats.get_stat(1), [1, 1])
+        self.assertEqual(self.stats.calls, 1)
+        self.assertEqual(self.stats.query_cache.counters, {'memory_hits': 1, 'disk_hits': 0, 'misses': 1})
+
+    def test_version_invalidates(self):
+
+        """
+        Unit Test cached_stat to ensure a new scorecard version recomputes the result.
+        """
+
+        self.stats.get_stat(1)
+        self.stats.version += 1
+        self.assertEqual(self.stats.get_stat(1), [1, 2])
+
+    def test_collections_kept_apart(self):
+
+        """
+        Unit Test cached_stat to ensure Stats reading other collections or servers never share a result.
+        """
+
+        self.stats = Fake_Stats(QueryCache())
+        self.stats.get_stat(1)
+        for other in [Fake_Stats(self.stats.query_cache, full_name='bench.Scorecards'), Fake_Stats(self.stats.query_cache, address=('golf', 27017))]:
+            self.assertEqual(other.get_stat(1), [1, 1])
+            self.assertEqual(other.calls, 1)
+        self.assertEqual(self.stats.get_stat(1), [1, 1])
+        self.assertEqual(self.stats.calls, 1)
+
+    def test_lru_eviction(self):
+
+        """
+        Unit Test QueryCache to ensure the least recently used result is dropped past the size limit.
+        """
+
+        self.stats.get_stat(1)
+        self.stats.get_stat(2)
+        self.stats.get_stat(1)
+        self.stats.get_stat(3)                                            # Course 2 is the least recently used.
+        self.assertEqual(self.stats.calls, 3)
+        self.stats.get_stat(1)
+        self.assertEqual(self.stats.calls, 3)
+        self.stats.get_stat(2)
+        self.assertEqual(self.stats.calls, 4)
+
+    def test_ttl(self):
+
+        """
+        Unit Test QueryCache to ensure results expire after the time to live.
+        """
+
+        cache = QueryCache(ttl=10)
+        with patch('My_Golf_Journey.src.bin.stat_apis.query_cache.time', return_value=100):
+            cache.put('key', 0, 'value')
+            self.assertEqual(cache.get('key', 0), (True, 'value'))
+        with patch('My_Golf_Journey.src.bin.stat_apis.query_cache.time', return_value=111):
+            self.assertEqual(cache.get('key', 0), (False, None))
+
+    def test_disk_tier(self):
+
+        """
+        Unit Test QueryCache to ensure results written to disk are read by a new process and bounded in number.
+        """
+
+        with TemporaryDirectory() as directory:
+            QueryCache(directory=directory, max_disk_entries=1).put('key', 3, {'a': 1})
+            cache = QueryCache(directory=directory)
+            self.assertEqual(cache.get('key', 3), (True, {'a': 1}))
+            self.assertEqual(cache.counters['disk_hits'], 1)
+            self.assertEqual(cache.get('key', 4), (False, None))
+            cache.max_disk_entries = 1
+            cache.put('one', 0, 1)
+            cache.put('two', 0, 2)
+            self.assertEqual(len(list(cache.directory.glob('*.pkl'))), 1)
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')
@@ -0,0 +1,78 @@
+# Script Description: Unit testing for the archive of raw scorecard responses and its replay into MongoDB.
+
+
+import unittest
+from sys import path
+from json import dumps
+from tempfile import TemporaryDirectory
+from pathlib import Path
+from unittest.mock import patch
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.garmin_scrapper.scorecard_archive import ScorecardArchive, read_archived_response, replay_archive
+
+module = 'My_Golf_Journey.src.bin.garmin_scrapper.scorecard_archive.'
+
+def response(*scorecards):
+
+    return dumps({'scorecardDetails': [{'scorecard': {'id': id, 'courseGlobalId': 100, 'lastModifiedDt': modified}} for id, modified in scorecards],
+        'courseSnapshots': [{'courseGlobalId': 100}]})
+
+class Test_Scorecard_Archive(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = TemporaryDirectory()
+        self.archive = ScorecardArchive(self.directory.name)
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def test_add(self):
+
+        """
+        Unit Test ScorecardArchive.add to ensure a response is stored once under its hash and reads back split into scorecards.
+        """
+
+        digest = self.archive.add(response((1, '2020-01-01'), (2, '2020-01-02')))
+        self.assertEqual(self.archive.add(response((1, '2020-01-01'), (2, '2020-01-02'))), digest)
+        self.assertEqual(self.archive.paths(), [self.archive.location(digest)])
+        documents, error = read_archived_response(self.archive.location(digest))
+        self.assertIsNone(error)
+        self.assertEqual(sorted(documents), [1, 2])
+
+    def test_replay(self):
+
+        """
+        Unit Test replay_archive to ensure every scorecard is written in batches with its last modified version and unreadable files are reported.
+        """
+
+        self.archive.add(response((1, '2020-01-01'), (2, '2020-01-02')))
+        self.archive.add(response((2, '2020-03-01'), (3, '2020-01-03')))
+        broken = Path(self.directory.name) / 'zz' / 'broken.json.gz'
+        broken.parent.mkdir()
+        broken.write_bytes(b'not gzip')
+        for payload in ['[]', 'null']:
+            self.archive.add(payload)                                             # Valid JSON that is not a response.
+        batches = []
+
+        def upsert(docs, conn):
+            batches.append({doc['scorecardDetails'][0]['scorecard']['id']: doc['scorecardDetails'][0]['scorecard']['lastModifiedDt'] for doc in docs})
+            return list(batches[-1]), [], {}
+
+        with patch(module + 'bulk_upsert_scorecards', side_effect=upsert):
+            counts = replay_archive(None, self.directory.name, workers=2, batch_size=2)
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual(dict(batch for written in batches for batch in written.items())[2], '2020-03-01')
+        self.assertEqual((counts['files'], counts['unreadable'], counts['scorecards'], counts['inserted']), (5, 3, 3, 3))
+        self.assertTrue(any('broken.json.gz' in error for error in counts['errors']))
+        self.assertEqual(sorted(error.split(': ')[1] for error in counts['errors'] if 'broken' not in error),
+            ['The response is a NoneType rather than an object.', 'The response is a list rather than an object.'])
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')
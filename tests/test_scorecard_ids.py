@@ -0,0 +1,63 @@
+# Script Description: Unit testing for streaming the scorecard ids out of saved page sources.
+
+
+import unittest
+from sys import path
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from re import findall
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.garmin_scrapper.scorecard_ids import iter_score_card_ids, source_pages
+
+class Test_Scorecard_Ids(unittest.TestCase):
+
+    def test_ids_across_chunks(self):
+
+        """
+        Unit Test iter_score_card_ids to ensure ids cut by a chunk boundary are still found and duplicates are dropped.
+        """
+
+        page = ['<div data-scorecard-id="155069', '236"></div><div data-score', 'card-id="12"></div>', '<div data-scorecard-id="155069236">']
+        self.assertEqual(list(iter_score_card_ids([page])), [155069236, 12])
+
+    def test_ids_across_pages(self):
+
+        """
+        Unit Test iter_score_card_ids to ensure every paginated page is read and ids are yielded lazily.
+        """
+
+        ids = iter_score_card_ids(['<a data-scorecard-id="1">', '<a data-scorecard-id="2"><a data-scorecard-id="1">'])
+        self.assertEqual(next(ids), 1)
+        self.assertEqual(list(ids), [2])
+
+    def test_saved_page_source(self):
+
+        """
+        Unit Test iter_score_card_ids against the saved page source read in small chunks.
+        """
+
+        source = Path(__file__).absolute().parent.parent / 'src' / 'data' / 'score_card_source.txt'
+        expected = [int(id) for id in findall('data-scorecard-id="(\\d+)"', source.read_text(encoding='utf-8'))]
+        self.assertEqual(list(iter_score_card_ids([source], chunk_size=97)), list(dict.fromkeys(expected)))
+
+    def test_source_pages(self):
+
+        """
+        Unit Test source_pages to ensure the paginated dumps are read in page order rather than name order.
+        """
+
+        with TemporaryDirectory() as directory:
+            names = ['score_card_source.txt'] + ['score_card_source_{}.txt'.format(page) for page in [10, 2, 11, 1]]
+            for name in names:
+                (Path(directory) / name).write_text('', encoding='utf-8')
+            pages = source_pages(Path(directory) / 'score_card_source.txt')
+            self.assertEqual([page.name for page in pages], ['score_card_source.txt', 'score_card_source_1.txt', 'score_card_source_2.txt',
+                'score_card_source_10.txt', 'score_card_source_11.txt'])
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')
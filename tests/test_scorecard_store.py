@@ -0,0 +1,121 @@
+# Script Description: Unit testing for the bulk checks and writes of scorecards in MongoDB.
+
+
+import unittest
+from sys import path
+from unittest.mock import patch
+path.extend('../')                                                        # Import the entire project.
+from My_Golf_Journey.src.bin.garmin_scrapper.scorecard_store import bulk_upsert_scorecards, find_missing_ids, stored_modified_times
+from My_Golf_Journey.src.bin.stat_apis.hole_rollups import rebuild_rollups, rollups_collection
+from My_Golf_Journey.src.bin.stat_apis.query_cache import current_version
+from pymongo.errors import BulkWriteError
+try:
+    from mongomock import MongoClient
+except ImportError:
+    MongoClient = None
+
+def scorecard(id, outcomes=('HIT', 'LEFT', 'HIT'), strokes=(4, 6, 3), modified='2020-09-16T23:18:11.000Z'):
+
+    holes = [{'number': number, 'strokes': stroke, 'putts': 2, 'fairwayShotOutcome': outcome}
+        for number, (outcome, stroke) in enumerate(zip(outcomes, strokes), start=1)]
+    return {'scorecardDetails': [{'scorecard': {'id': id, 'courseGlobalId': 17772, 'lastModifiedDt': modified, 'holes': holes}}],
+        'courseSnapshots': [{'courseGlobalId': 17772, 'holePars': '453'}]}
+
+def nonzero(counters):
+
+    return {key: nonzero(value) if isinstance(value, dict) else value for key, value in counters.items() if value != 0}
+
+def rollups(collection):
+
+    """
+    Read the rollups without the counters that dropped to zero, as a rebuild never writes them.
+    """
+
+    return sorted(([rollup['_id']['hole'], nonzero(rollup)] for rollup in rollups_collection(collection).find()), key=lambda rollup: rollup[0])
+
+@unittest.skipIf(MongoClient is None, 'mongomock is not installed.')
+class Test_Scorecard_Store(unittest.TestCase):
+
+    def setUp(self):
+
+        self.collection = MongoClient().golf.Scorecards
+
+    def test_find_stored(self):
+
+        """
+        Unit Test find_missing_ids and stored_modified_times against the scorecards that are stored.
+        """
+
+        bulk_upsert_scorecards([scorecard(1), scorecard(2, modified=None)], self.collection)
+        self.assertEqual(find_missing_ids([3, 1, 3, 2, 4], self.collection), [3, 4])
+        self.assertEqual(stored_modified_times([1, 2, 3], self.collection), {1: '2020-09-16T23:18:11.000Z', 2: None})
+
+    def test_inserted_and_replaced(self):
+
+        """
+        Unit Test bulk_upsert_scorecards to ensure a mixed batch reports new and stored scorecards apart and keeps one document per id.
+        """
+
+        self.assertEqual(bulk_upsert_scorecards([scorecard(1), scorecard(2)], self.collection), ([1, 2], [], {}))
+        inserted, replaced, failed = bulk_upsert_scorecards([scorecard(3), scorecard(1, strokes=(5, 5, 3)), scorecard(4)], self.collection)
+        self.assertEqual((inserted, replaced, failed), ([3, 4], [1], {}))
+        self.assertEqual(self.collection.count_documents({}), 4)
+        self.assertEqual(self.collection.find_one({'scorecardDetails.scorecard.id': 1})['scorecardDetails'][0]['scorecard']['holes'][0]['strokes'], 5)
+
+    def test_write_failures(self):
+
+        """
+        Unit Test bulk_upsert_scorecards to ensure the ids of a failed bulk write are split into inserted, replaced and failed,
+            and only the scorecards written reach the rollups.
+        """
+
+        bulk_upsert_scorecards([scorecard(1), scorecard(2)], self.collection)
+        bulk_write = self.collection.bulk_write
+
+        def fail_second(requests, ordered=True):
+            bulk_write(requests[:1] + requests[2:], ordered=ordered)                        # The server carries on past the failed write.
+            raise BulkWriteError({'writeErrors': [{'index': 1, 'code': 11000, 'errmsg': 'E11000 duplicate key'}], 'upserted': [{'index': 2, '_id': 'new'}]})
+
+        with patch.object(self.collection, 'bulk_write', side_effect=fail_second):
+            inserted, replaced, failed = bulk_upsert_scorecards([scorecard(1, outcomes=('HIT', 'HIT', 'HIT')), scorecard(2), scorecard(3)], self.collection)
+        self.assertEqual((inserted, replaced, failed), ([3], [1], {2: 'E11000 duplicate key'}))
+        incremental = rollups(self.collection)
+        rebuild_rollups(self.collection)
+        self.assertEqual(incremental, rollups(self.collection))
+
+    def test_rollups_after_edit(self):
+
+        """
+        Unit Test bulk_upsert_scorecards to ensure the rollups kept in step with inserts and edits match the rollups rebuilt from scratch.
+        """
+
+        bulk_upsert_scorecards([scorecard(1), scorecard(2)], self.collection)
+        bulk_upsert_scorecards([scorecard(2, outcomes=('RIGHT', 'HIT', 'HIT'), strokes=(3, 7, 2)), scorecard(3)], self.collection)
+        incremental = rollups(self.collection)
+        self.assertEqual(incremental[0][1]['rounds'], 3)
+        self.assertEqual(incremental[0][1]['fairway']['RIGHT'], 1)
+        rebuild_rollups(self.collection)
+        self.assertEqual(incremental, rollups(self.collection))
+
+    def test_version_bump(self):
+
+        """
+        Unit Test bulk_upsert_scorecards to ensure the cached stats are only invalidated when a scorecard was written.
+        """
+
+        bulk_upsert_scorecards([], self.collection)
+        self.assertEqual(current_version(self.collection), 0)
+        bulk_upsert_scorecards([scorecard(1)], self.collection)
+        self.assertEqual(current_version(self.collection), 1)
+        error = BulkWriteError({'writeErrors': [{'index': 0, 'code': 11000, 'errmsg': 'E11000 duplicate key'}]})
+        with patch.object(self.collection, 'bulk_write', side_effect=error):
+            self.assertEqual(bulk_upsert_scorecards([scorecard(1)], self.collection), ([], [], {1: 'E11000 duplicate key'}))
+        self.assertEqual(current_version(self.collection), 1)
+
+if __name__ == '__main__':
+
+    try:
+        unittest.main()
+    except:
+        pass
+    print('\n\n')